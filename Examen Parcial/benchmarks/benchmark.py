@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from src.algoritmos_alineamiento import NeedlemanWunsch, SmithWaterman
+from src.secuencias import ALPHABETS
+from src.utils import load_sequence_from_file
+
+# Uso (desde "Examen Parcial"):
+#   PYTHONPATH=. python benchmarks/benchmark.py --sizes 100 1000 --output resultados.json
+#   PYTHONPATH=. python benchmarks/benchmark.py --baseline benchmarks/baseline.json
+#   PYTHONPATH=. python benchmarks/benchmark.py --save-baseline benchmarks/baseline.json
+
+EXAMPLES = {
+    "hemoglobina": ("examples/hemoglobin-homo-sapiens.txt", "examples/hemoglobin-rabbit.txt"),
+    "insulina": ("examples/insulin-homo-sapiens.txt", "examples/insulin-gorilla.txt"),
+}
+
+
+def related_pair(length, alphabet, seed=0, divergence=0.1):
+    """
+    Par sintético: una secuencia aleatoria y una copia con ~divergence de
+    sustituciones y algunas inserciones/eliminaciones
+    """
+    rng = random.Random(f"{length}-{alphabet}-{seed}")
+    seq1 = [rng.choice(alphabet) for _ in range(length)]
+    seq2 = list(seq1)
+    for _ in range(int(length * divergence)):
+        k = rng.randrange(len(seq2))
+        roll = rng.random()
+        if roll < 0.8:
+            seq2[k] = rng.choice(alphabet)
+        elif roll < 0.9:
+            seq2.insert(k, rng.choice(alphabet))
+        elif len(seq2) > 1:
+            del seq2[k]
+    return ''.join(seq1), ''.join(seq2)
+
+
+def matrix_phases(aligner):
+    """
+    Fases de alignment(mode="matrix"): inicialización, llenado, traceback y find_max (SW)
+    """
+    def run(seq1, seq2, phase):
+        matrix = phase("initialize_matrix", aligner.initialize_matrix, seq1, seq2)
+        matrix = phase("fill_matrix", aligner.fill_matrix, matrix, seq1, seq2)
+        if isinstance(aligner, SmithWaterman):
+            _, score = phase("find_max", aligner.find_max, matrix)
+        else:
+            score = matrix[len(seq1)][len(seq2)]
+        phase("traceback", aligner.traceback, seq1, seq2, matrix)
+        return score
+    return run
+
+
+def single_phase(aligner, mode):
+    """
+    Motores sin fases separables: una sola fase "alignment" (o "score_only")
+    """
+    def run(seq1, seq2, phase):
+        if mode == "score_only":
+            return phase("score_only", aligner.score_only, seq1, seq2)
+        return phase("alignment", aligner.alignment, seq1, seq2, mode)[2]
+    return run
+
+
+def parallel_phase(aligner, jobs):
+    """
+    Modo paralelo (bloques por frente de onda) con jobs procesos: una sola fase "parallel"
+    """
+    from src.paralelo import parallel_alignment
+
+    def run(seq1, seq2, phase):
+        return phase("parallel", parallel_alignment, aligner, seq1, seq2, jobs)[2]
+    return run
+
+
+def engines(jobs=None):
+    """
+    Motores a medir: nombre -> (fábrica de la función de fases, límite de celdas, límite de largo)
+    Los casos que superan algún límite se omiten (el llenado completo en Python puro
+    no llega a 100k x 100k). jobs: procesos del modo paralelo (por defecto, todos los núcleos).
+    """
+    from src.vectorizado import NeedlemanWunschNumpy, SmithWatermanNumpy
+    from src.myers import NeedlemanWunschMyers
+
+    return {
+        "nw": (lambda: matrix_phases(NeedlemanWunsch()), 4e6, None),
+        "sw": (lambda: matrix_phases(SmithWaterman()), 4e6, None),
+        "nw-numpy": (lambda: matrix_phases(NeedlemanWunschNumpy()), 1e8, None),
+        "sw-numpy": (lambda: matrix_phases(SmithWatermanNumpy()), 1e8, None),
+        "nw-linear": (lambda: single_phase(NeedlemanWunsch(), "linear"), 4e6, None),
+        "sw-linear": (lambda: single_phase(SmithWaterman(), "linear"), 4e6, None),
+        "nw-pointers": (lambda: single_phase(NeedlemanWunsch(), "pointers"), 4e6, None),
+        "sw-pointers": (lambda: single_phase(SmithWaterman(), "pointers"), 4e6, None),
+        "nw-gotoh": (lambda: single_phase(NeedlemanWunsch(gap_open=-10, gap_extend=-1), "pointers"), 4e6, None),
+        "sw-gotoh": (lambda: single_phase(SmithWaterman(gap_open=-10, gap_extend=-1), "pointers"), 4e6, None),
+        "nw-parallel": (lambda: parallel_phase(NeedlemanWunschNumpy(), jobs), 1e8, None),
+        "sw-parallel": (lambda: parallel_phase(SmithWatermanNumpy(), jobs), 1e8, None),
+        "nw-banded": (lambda: single_phase(NeedlemanWunsch(), "banded"), None, 10000),
+        "nw-myers": (lambda: single_phase(NeedlemanWunschMyers(), "score_only"), None, 100000),
+        "nw-anchors": (lambda: single_phase(NeedlemanWunschNumpy(), "anchors"), None, None),
+    }
+
+
+def measure(run, seq1, seq2, memory=True, repeats=1):
+    """
+    Ejecuta un caso repeats veces para el tiempo (sin tracemalloc, que lo distorsiona),
+    quedándose con el mínimo de cada fase (el menos afectado por el ruido), y una vez
+    más para el pico de memoria de cada fase (tracemalloc la hace ~20 veces más lenta).
+    """
+    phases = {}
+
+    def timed(name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        seconds = time.perf_counter() - start
+        if name not in phases or seconds < phases[name]["seconds"]:
+            phases[name] = {"seconds": seconds}
+        return result
+
+    def traced(name, func, *args):
+        tracemalloc.reset_peak()
+        result = func(*args)
+        phases[name]["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        return result
+
+    for _ in range(max(repeats, 1)):
+        score = run(seq1, seq2, timed)
+    # Escalares NumPy -> int/float de Python (JSON)
+    score = score.item() if hasattr(score, 'item') else score
+    if memory:
+        tracemalloc.start()
+        try:
+            run(seq1, seq2, traced)
+        finally:
+            tracemalloc.stop()
+    return score, phases
+
+
+def datasets(sizes):
+    """
+    Genera (nombre, seq1, seq2): pares sintéticos de ADN y proteína y los ejemplos
+    """
+    for size in sizes:
+        for kind in ("dna", "protein"):
+            yield f"{kind}-{size}", *related_pair(size, ALPHABETS[kind])
+    for name, (path1, path2) in EXAMPLES.items():
+        yield name, load_sequence_from_file(path1), load_sequence_from_file(path2)
+
+
+def run_benchmarks(sizes, selected=None, memory_cells=2.5e5, repeats=3, jobs=None):
+    """
+    Mide cada motor sobre cada par (mínimo de repeats ejecuciones); el pico de memoria
+    solo hasta memory_cells celdas
+    """
+    results = []
+    available = engines(jobs)
+    for dataset, seq1, seq2 in datasets(sizes):
+        cells = len(seq1) * len(seq2)
+        for engine, (factory, max_cells, max_length) in available.items():
+            if selected and engine not in selected:
+                continue
+            if (max_cells is not None and cells > max_cells) or \
+                    (max_length is not None and max(len(seq1), len(seq2)) > max_length):
+                continue
+
+            score, phases = measure(factory(), seq1, seq2, cells <= memory_cells, repeats)
+            seconds = sum(phase["seconds"] for phase in phases.values())
+            results.append({
+                "engine": engine,
+                "dataset": dataset,
+                "len1": len(seq1),
+                "len2": len(seq2),
+                "score": score,
+                "seconds": seconds,
+                "cups": cells / seconds if seconds else None,
+                "phases": phases,
+            })
+            print(f"{engine:<12} {dataset:<16} {len(seq1):>7}x{len(seq2):<7} "
+                  f"{seconds:>9.4f} s  {results[-1]['cups'] or 0:>12.3e} CUPS")
+    return results
+
+
+def compare(results, baseline, tolerance, min_seconds=0.05):
+    """
+    Compara con una ejecución guardada: regresión si el tiempo crece más de tolerance
+    (o si cambia la puntuación). Los casos que duran menos de min_seconds en ambas
+    ejecuciones son puro ruido de temporización: en ellos solo se compara la puntuación.
+    Devuelve la lista de regresiones.
+    """
+    previous = {(entry["engine"], entry["dataset"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry["engine"], entry["dataset"]))
+        if old is None:
+            continue
+        ratio = entry["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        slower = ratio > 1 + tolerance and max(entry["seconds"], old["seconds"]) >= min_seconds
+        if slower or entry["score"] != old["score"]:
+            regressions.append({"engine": entry["engine"], "dataset": entry["dataset"],
+                                "ratio": ratio, "score": entry["score"], "baseline_score": old["score"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de alineamiento")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--engines", nargs="+", help="motores a medir (por defecto, todos)")
+    parser.add_argument("--output", default="benchmarks/resultados.json", help="JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para comparar")
+    parser.add_argument("--save-baseline", help="además guarda los resultados como baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="aumento de tiempo tolerado (0.2 = 20%%)")
+    parser.add_argument("--repeats", type=int, default=3, help="ejecuciones por caso (se toma el mínimo)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="por debajo de esta duración solo se compara la puntuación con el baseline")
+    parser.add_argument("--jobs", type=int, help="procesos de nw-parallel / sw-parallel (por defecto, todos los núcleos)")
+    parser.add_argument("--memory-cells", type=float, default=2.5e5,
+                        help="medir el pico de memoria solo hasta este número de celdas (0 = nunca)")
+    args = parser.parse_args(argv)
+
+    print("="*80)
+    print(" BENCHMARK: CELDAS POR SEGUNDO (CUPS) ".center(80, " "))
+    print("="*80)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": args.repeats,
+        "jobs": args.jobs or os.cpu_count(),
+        "results": run_benchmarks(args.sizes, args.engines, args.memory_cells, args.repeats, args.jobs),
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report["results"], json.load(f), args.tolerance, args.min_seconds)
+        report["regressions"] = regressions
+        for entry in regressions:
+            print(f"REGRESIÓN {entry['engine']} {entry['dataset']}: x{entry['ratio']:.2f} tiempo, "
+                  f"score {entry['score']} (baseline {entry['baseline_score']})")
+        print(f"\nComparación con {args.baseline}: {len(regressions)} regresiones")
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Resultados guardados en: {path}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
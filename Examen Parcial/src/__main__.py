@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import sys
+
+# Uso (desde "Examen Parcial"):
+#   python -m src consultas.fasta registros.fasta --algorithm sw --jobs 4 > resultados.tsv
+#   python -m src consultas.fasta registros.fasta --format jsonl --score-only | head
+#   python -m src a.fasta b.fasta --algorithm nw --report output/
+# Alinea cada consulta contra cada registro y escribe una línea por par a medida que
+# terminan. Los módulos se importan solo al usarse (la visualización, solo con --report).
+
+ALGORITHMS = ("nw", "sw", "nw-numpy", "sw-numpy", "nw-myers")
+
+# Modos de alignment() que admite cada tipo de alineamiento (y con gaps afines, ver driver_mode)
+GLOBAL_MODES = ("matrix", "linear", "pointers", "banded", "compact", "parallel", "anchors")
+LOCAL_MODES = ("matrix", "linear", "pointers", "compact", "parallel")
+AFFINE_MODES = ("matrix", "linear", "pointers", "anchors")
+
+TSV_COLUMNS = ["query", "subject", "score", "length", "matches", "mismatches", "gaps", "identity",
+               "start1", "end1", "start2", "end2", "cigar"]
+
+
+def scoring_params(args):
+    """
+    Parámetros de puntuación indicados en la línea de comandos (los demás, por defecto)
+    """
+    names = ("match", "mismatch", "gap", "substitution_matrix", "gap_open", "gap_extend")
+    return {name: getattr(args, name) for name in names if getattr(args, name) is not None}
+
+
+def pair_requests(args):
+    """
+    Genera una petición por par (consulta, registro); el FASTA de registros se
+    vuelve a recorrer por cada consulta en lugar de guardarse en memoria
+    """
+    from .utils import read_fasta
+
+    params = scoring_params(args)
+    for query_header, query in read_fasta(args.query):
+        for subject_header, subject in read_fasta(args.subject):
+            yield {"id": (query_header, subject_header), "algorithm": args.algorithm, "params": params,
+                   "seq1": query, "seq2": subject, "mode": args.mode,
+                   "score_only": args.score_only, "cigar": not args.score_only}
+
+
+def _chunks(requests, size):
+    chunk = []
+    for request in requests:
+        chunk.append(request)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batches(requests, jobs, batch_size):
+    """
+    Resuelve las peticiones en lotes de batch_size en un pool de jobs procesos,
+    con un número acotado de lotes pendientes. Genera (lote, respuestas) en orden de finalización.
+    """
+    from .busqueda import align_batch, pool_map
+
+    return pool_map(align_batch, _chunks(requests, batch_size), jobs)
+
+
+def result_row(request, response):
+    """
+    Fila de resultados de un par; con CIGAR, estadísticas y coordenadas en O(tramos)
+    """
+    query, subject = request["id"]
+    row = {"query": query, "subject": subject, "score": response.get("score")}
+    if "error" in response:
+        row["error"] = response["error"]
+    elif "cigar" in response:
+        from .cigar import AlineamientoCigar
+
+        cigar = AlineamientoCigar.parse(response["cigar"], response["start1"], response["start2"])
+        stats = cigar.stats()
+        row.update(length=stats.length, matches=stats.matches, mismatches=stats.mismatches, gaps=stats.gaps,
+                   identity=round(stats.identity, 2), start1=cigar.start1, end1=cigar.end1,
+                   start2=cigar.start2, end2=cigar.end2, cigar=str(cigar))
+    return row
+
+
+def write_report(directory, number, request, row):
+    """
+    Reporte por bloques de un par (--report); aquí se carga la visualización
+    """
+    from .cigar import AlineamientoCigar
+    from .visualization import save_alignment_to_file
+
+    seq1, seq2 = request["seq1"], request["seq2"]
+    cigar = AlineamientoCigar.parse(row["cigar"], row["start1"], row["start2"])
+    aligned1, aligned2 = cigar.to_strings(seq1, seq2)
+    title = f"{request['algorithm'].upper()}: {row['query'].split()[0]} vs {row['subject'].split()[0]}"
+    save_alignment_to_file(seq1, seq2, aligned1, aligned2, row["score"], title,
+                           f"alineamiento_{number:06d}.txt", output_dir=directory)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src",
+                                     description="Alinea cada consulta contra cada registro de dos FASTA")
+    parser.add_argument("query", help="FASTA de consultas")
+    parser.add_argument("subject", help="FASTA de registros")
+    parser.add_argument("--algorithm", default="sw", choices=ALGORITHMS, help="por defecto sw")
+    parser.add_argument("--match", type=int)
+    parser.add_argument("--mismatch", type=int)
+    parser.add_argument("--gap", type=int)
+    parser.add_argument("--matrix", dest="substitution_matrix", help="BLOSUM62, PAM250, DNA o ruta de archivo")
+    parser.add_argument("--gap-open", type=int)
+    parser.add_argument("--gap-extend", type=int)
+    parser.add_argument("--mode", default="pointers", choices=GLOBAL_MODES,
+                        help="modo de alineamiento (por defecto pointers; banded y anchors solo en global)")
+    parser.add_argument("--score-only", action="store_true", help="solo la puntuación, sin traceback")
+    parser.add_argument("--jobs", type=int, help="procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--batch-size", type=int, default=16, help="pares por tarea del pool")
+    parser.add_argument("--format", choices=("tsv", "jsonl"), default="tsv")
+    parser.add_argument("--output", help="archivo de resultados (por defecto, salida estándar)")
+    parser.add_argument("--report", metavar="DIR", help="además, un reporte por bloques de cada par en DIR")
+    args = parser.parse_args(argv)
+
+    if args.report and args.score_only:
+        parser.error("--report necesita el alineamiento (no se puede usar con --score-only)")
+    if args.algorithm.startswith("sw") and args.mode not in LOCAL_MODES:
+        parser.error(f"el modo {args.mode} no existe en alineamiento local ({args.algorithm})")
+    if (args.gap_open is not None or args.gap_extend is not None) and args.mode not in AFFINE_MODES:
+        parser.error(f"el modo {args.mode} no admite gaps afines")
+    for path in (args.query, args.subject):
+        if not os.path.isfile(path):
+            parser.error(f"no existe el archivo: {path}")
+
+    jobs = args.jobs or os.cpu_count() or 1
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    errors = 0
+    number = 0
+    try:
+        if args.format == "tsv":
+            columns = TSV_COLUMNS[:3] if args.score_only else TSV_COLUMNS
+            out.write("\t".join(columns) + "\n")
+
+        for chunk, responses in run_batches(pair_requests(args), jobs, args.batch_size):
+            for request, response in zip(chunk, responses):
+                row = result_row(request, response)
+                if "error" in row:
+                    errors += 1
+                    print(f"{row['query']} vs {row['subject']}: {row['error']}", file=sys.stderr)
+                    continue
+
+                number += 1
+                if args.report:
+                    write_report(args.report, number, request, row)
+                if args.format == "jsonl":
+                    out.write(json.dumps(row) + "\n")
+                else:
+                    out.write("\t".join(str(row.get(column, "")) for column in columns) + "\n")
+            out.flush()
+    except BrokenPipeError:
+        # La salida se cerró antes de tiempo (por ejemplo, | head): se descarta el resto
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 0
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
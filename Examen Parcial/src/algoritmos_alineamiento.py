@@ -1,22 +1,480 @@
+import mmap
+import time
+from array import array
+
 from .utils import validate_dna, validate_protein
+from .matrices_sustitucion import get_substitution_matrix
+from .secuencias import SecuenciaCodificada
+from .cigar import AlineamientoCigar, MATCH, MISMATCH, DELETION, INSERTION
+
+# Direcciones de traceback (2 bits por celda)
+STOP, DIAGONAL, UP, LEFT = 0, 1, 2, 3
+
+
+class MatrizPunteros:
+    """
+    Matriz de direcciones de traceback empaquetada a 2 bits por celda (4 celdas por byte)
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.stride = (cols + 3) // 4
+        self.data = bytearray(rows * self.stride)
+
+    def set_row(self, i, directions):
+        """
+        Empaqueta una fila completa de direcciones
+        """
+        d = list(directions) + [STOP] * (-len(directions) % 4)
+        packed = bytes(a | b << 2 | c << 4 | e << 6
+                       for a, b, c, e in zip(d[0::4], d[1::4], d[2::4], d[3::4]))
+        start = i * self.stride
+        self.data[start:start + self.stride] = packed
+
+    def get(self, i, j):
+        return (self.data[i * self.stride + j // 4] >> (2 * (j % 4))) & 3
+
+
+class MatrizBanda:
+    """
+    Matriz guardada solo dentro de una banda de diagonales lo <= j - i <= hi.
+    Cada fila i guarda las columnas max(0, i + lo) .. min(cols - 1, i + hi).
+    Las celdas fuera de la banda valen -infinito.
+    """
+
+    def __init__(self, rows, cols, lo, hi):
+        self.rows = rows
+        self.cols = cols
+        self.lo = lo
+        self.hi = hi
+        self.data = []
+
+    def row_range(self, i):
+        """
+        Primera y última columna de la fila i dentro de la banda
+        """
+        return max(0, i + self.lo), min(self.cols - 1, i + self.hi)
+
+    def covers_all(self):
+        return self.lo <= -(self.rows - 1) and self.hi >= self.cols - 1
+
+    def get(self, i, j):
+        start, end = self.row_range(i)
+        if start <= j <= end:
+            return self.data[i][j - start]
+        return float('-inf')
+
+
+class MatrizCompacta:
+    """
+    Matriz densa en un solo búfer plano (4 bytes por celda con typecode 'i').
+    - sin path: array de la biblioteca estándar, en memoria
+    - con path: archivo mapeado con mmap; el sistema operativo carga solo las páginas que se usan
+    matrix[i] devuelve la fila i como memoryview (sin copia), así que matrix[i][j]
+    se lee y se escribe igual que con listas de listas (print_matrix, traceback, ...).
+    """
+
+    def __init__(self, rows, cols, typecode='i', path=None):
+        self.rows = rows
+        self.cols = cols
+        self.typecode = typecode
+        self.path = path
+        self._file = None
+        self._mmap = None
+
+        size = rows * cols * array(typecode).itemsize
+        if path is None:
+            self.data = memoryview(array(typecode, bytes(size)))
+        else:
+            self._file = open(path, 'w+b')
+            self._file.truncate(size)
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+            self.data = memoryview(self._mmap).cast(typecode)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def to_numpy(self):
+        """
+        Vista 2D de NumPy sobre el mismo búfer (sin copia)
+        """
+        import numpy as np
+        return np.frombuffer(self.data, dtype=np.dtype(self.typecode)).reshape(self.rows, self.cols)
+
+    def tolist(self):
+        return [row.tolist() for row in self]
+
+    def close(self):
+        """
+        Libera el búfer (y el archivo si está mapeado); las filas obtenidas antes dejan de ser válidas
+        """
+        self.data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError("Fila fuera de la matriz")
+        return self.data[i * self.cols:(i + 1) * self.cols]
+
+    def __iter__(self):
+        for i in range(self.rows):
+            yield self[i]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ===============================================================================
+class MetricasAlineamiento:
+    """
+    Métricas acumuladas de alignment():
+    - phases: segundos por fase (initialize_matrix, fill_matrix, traceback, find_max, ...)
+    - counters: alignments, cells (celdas de la recurrencia, sin recálculos),
+      traceback_steps, matrix_cells y matrix_bytes (cuando se conoce)
+    Cualquier objeto con phase(name, seconds) y count(name, value) sirve como métricas,
+    por ejemplo para exportarlas a otro sistema.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
 
+    def phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        self.phases.clear()
+        self.counters.clear()
+
+    def as_dict(self):
+        return {"phases": dict(self.phases), "counters": dict(self.counters)}
+
+
+# ===============================================================================
 class AlgoritmoAlineamiento:
-    def __init__(self, match=1, mismatch=-1, gap=-2):
+    def __init__(self, match=1, mismatch=-1, gap=-2, substitution_matrix=None,
+                 gap_open=None, gap_extend=None, metrics=None):
         """
         - match: puntuación por coincidencia
         - mismatch: penalización por no coincidencia
         - gap: penalización por un espacio
+        - substitution_matrix: MatrizSustitucion, nombre (BLOSUM62, PAM250, DNA) o
+          ruta de archivo; reemplaza a match/mismatch
+        - gap_open / gap_extend: gaps afines (Gotoh); un gap de largo L puntúa
+          gap_open + (L - 1) * gap_extend. Si falta uno, se usa gap en su lugar.
+          Se exige gap_open <= gap_extend <= 0 (la recurrencia de Gotoh supone que
+          extender un gap no cuesta más que abrir uno nuevo).
+        - metrics: MetricasAlineamiento (u objeto compatible) para medir cada fase;
+          con None no se mide nada
         """
         self.match = match
         self.mismatch = mismatch
         self.gap = gap
+        self.substitution_matrix = None
+        if substitution_matrix is not None:
+            self.substitution_matrix = get_substitution_matrix(substitution_matrix)
+
+        self.affine = gap_open is not None or gap_extend is not None
+        self.gap_open = gap if gap_open is None else gap_open
+        self.gap_extend = gap if gap_extend is None else gap_extend
+        if self.affine and not self.gap_open <= self.gap_extend <= 0:
+            raise ValueError("Gaps afines: se requiere gap_open <= gap_extend <= 0")
+        self.metrics = metrics
+    
+    def run_phase(self, name, func, *args):
+        """
+        Ejecuta una fase de alignment(); con metrics, registra su duración
+        """
+        if self.metrics is None:
+            return func(*args)
+        start = time.perf_counter()
+        result = func(*args)
+        self.metrics.phase(name, time.perf_counter() - start)
+        return result
+
+    def record_alignment(self, seq1, seq2, result):
+        """
+        Con metrics, cuenta celdas, pasos de traceback y tamaño de la matriz del resultado.
+        Devuelve result sin cambios.
+        """
+        if self.metrics is None:
+            return result
+
+        aligned_seq1, _, _, matrix = result
+        cells = len(seq1) * len(seq2)
+        if isinstance(matrix, MatrizBanda):
+            cells = sum(len(row) for row in matrix.data)
+        self.metrics.count("alignments")
+        self.metrics.count("cells", cells)
+        self.metrics.count("traceback_steps", len(aligned_seq1))
+        if matrix is not None:
+            self.metrics.count("matrix_cells", cells if isinstance(matrix, MatrizBanda)
+                               else (len(seq1) + 1) * (len(seq2) + 1))
+            if hasattr(matrix, 'nbytes'):
+                self.metrics.count("matrix_bytes", matrix.nbytes)
+            elif isinstance(matrix, MatrizPunteros):
+                self.metrics.count("matrix_bytes", len(matrix.data))
+        return result
     
     def calculate_score(self, a, b):
+        if self.substitution_matrix is not None:
+            return self.substitution_matrix.score(a, b)
         if a == b:
             return self.match
         else:
             return self.mismatch
+
+    def score_table(self, seq1, seq2):
+        """
+        Codifica ambas secuencias y devuelve la tabla de puntuaciones por código.
+        - con matriz de sustitución: códigos y tabla de la matriz
+        - sin ella: alfabeto de ambas secuencias y calculate_score para cada par
+        - dos SecuenciaCodificada con el mismo alfabeto usan sus códigos directamente
+        Los bucles de llenado usan table[codes1[i-1]][codes2[j-1]] en lugar de calculate_score.
+        """
+        if self.substitution_matrix is not None:
+            matrix = self.substitution_matrix
+            return matrix.encode(seq1), matrix.encode(seq2), matrix.table
+
+        if (isinstance(seq1, SecuenciaCodificada) and isinstance(seq2, SecuenciaCodificada)
+                and seq1.alphabet == seq2.alphabet):
+            # Los códigos ya están listos: no se vuelve a codificar
+            alphabet = seq1.alphabet
+            table = [[self.calculate_score(a, b) for b in alphabet] for a in alphabet]
+            return seq1.codes, seq2.codes, table
+
+        seq1, seq2 = str(seq1), str(seq2)
+        alphabet = sorted(set(seq1) | set(seq2))
+        index = {residue: code for code, residue in enumerate(alphabet)}
+        table = [[self.calculate_score(a, b) for b in alphabet] for a in alphabet]
+        return [index[c] for c in seq1], [index[c] for c in seq2], table
     
+    def score_alignment(self, aligned1, aligned2):
+        """
+        Calcula la puntuación de un alineamiento ya construido
+        """
+        score = 0
+        previous = None
+        for a, b in zip(aligned1, aligned2):
+            if a == '-' or b == '-':
+                # Con gaps afines, un gap en la misma secuencia que el anterior lo extiende
+                current = UP if b == '-' else LEFT
+                if not self.affine:
+                    score += self.gap
+                elif current == previous:
+                    score += self.gap_extend
+                else:
+                    score += self.gap_open
+                previous = current
+            else:
+                score += self.calculate_score(a, b)
+                previous = None
+        return score
+
+    def pointer_traceback(self, seq1, seq2, pointers, start):
+        """
+        Reconstruye el alineamiento siguiendo las direcciones guardadas desde start
+        """
+        aligned_seq1 = []
+        aligned_seq2 = []
+        i, j = start
+
+        direction = pointers.get(i, j)
+        while direction != STOP:
+            if direction == DIAGONAL:
+                aligned_seq1.append(seq1[i-1])
+                aligned_seq2.append(seq2[j-1])
+                i -= 1
+                j -= 1
+            elif direction == UP:
+                aligned_seq1.append(seq1[i-1])
+                aligned_seq2.append('-')
+                i -= 1
+            else:
+                aligned_seq1.append('-')
+                aligned_seq2.append(seq2[j-1])
+                j -= 1
+            direction = pointers.get(i, j)
+
+        return ''.join(reversed(aligned_seq1)), ''.join(reversed(aligned_seq2))
+
+    def pointer_cigar(self, seq1, seq2, pointers, start):
+        """
+        Mismo recorrido que pointer_traceback, acumulando tramos de operaciones
+        en lugar de un carácter por paso. Devuelve AlineamientoCigar.
+        """
+        runs = []
+        i, j = start
+
+        direction = pointers.get(i, j)
+        while direction != STOP:
+            if direction == DIAGONAL:
+                op = MATCH if seq1[i-1] == seq2[j-1] else MISMATCH
+                i -= 1
+                j -= 1
+            elif direction == UP:
+                op = DELETION
+                i -= 1
+            else:
+                op = INSERTION
+                j -= 1
+
+            if runs and runs[-1][0] == op:
+                runs[-1][1] += 1
+            else:
+                runs.append([op, 1])
+            direction = pointers.get(i, j)
+
+        return AlineamientoCigar(reversed(runs), i, j)
+
+    def strings_cigar(self, aligned_seq1, aligned_seq2, end):
+        """
+        AlineamientoCigar de dos cadenas alineadas que terminan en la celda end = (i, j)
+        """
+        cigar = AlineamientoCigar.from_strings(aligned_seq1, aligned_seq2)
+        return AlineamientoCigar(cigar.operations, end[0] - cigar.end1, end[1] - cigar.end2)
+
+    def fill_affine(self, seq1, seq2, local=False, keep_pointers=True):
+        """
+        Recurrencias de Gotoh con filas rotativas:
+        - H: mejor puntuación en la celda
+        - E: terminando en gap vertical (consume seq1), F: en gap horizontal (consume seq2)
+        Por celda se guardan dos MatrizPunteros de 2 bits (4 bits en total):
+        - directions: de dónde viene H (DIAGONAL, UP = de E, LEFT = de F, STOP)
+        - flags: bit 0 si E extiende el gap de arriba, bit 1 si F extiende el de la izquierda
+        En empates se prefiere abrir el gap (con gap_open == gap_extend == gap el
+        resultado es el mismo que con gap lineal).
+        - local=True: Smith-Waterman (mínimo 0, STOP en las celdas con 0)
+        Devuelve (directions, flags, posición final, puntuación); sin punteros si keep_pointers=False.
+        """
+        gap_open, gap_extend = self.gap_open, self.gap_extend
+        cols = len(seq2) + 1
+        negative = float('-inf')
+
+        directions = flags = None
+        if keep_pointers:
+            directions = MatrizPunteros(len(seq1) + 1, cols)
+            flags = MatrizPunteros(len(seq1) + 1, cols)
+
+        if local:
+            prev_row = [0] * cols
+        else:
+            prev_row = [0] + [gap_open + (j - 1) * gap_extend for j in range(1, cols)]
+            if keep_pointers:
+                directions.set_row(0, [STOP] + [LEFT] * (cols - 1))
+                flags.set_row(0, [0, 0] + [2] * (cols - 2))
+        prev_vertical = [negative] * cols
+
+        max_value = 0
+        max_pos = (0, 0)
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
+            first = 0 if local else gap_open + (i - 1) * gap_extend
+            row = [first] + [0] * (cols - 1)
+            vertical = [first if not local else negative] + [0] * (cols - 1)
+            row_directions = [STOP if local else UP] + [STOP] * (cols - 1)
+            row_flags = [1 if not local and i > 1 else 0] + [0] * (cols - 1)
+            horizontal = negative
+            for j in range(1, cols):
+                open_vertical = prev_row[j] + gap_open
+                extend_vertical = prev_vertical[j] + gap_extend
+                open_horizontal = row[j-1] + gap_open
+                extend_horizontal = horizontal + gap_extend
+                vertical[j] = max(open_vertical, extend_vertical)
+                horizontal = max(open_horizontal, extend_horizontal)
+                row_flags[j] = (extend_vertical > open_vertical) | (extend_horizontal > open_horizontal) << 1
+
+                match_mismatch = prev_row[j-1] + scores[codes2[j-1]]
+                score = max(match_mismatch, vertical[j], horizontal)
+                if local and score <= 0:
+                    row[j] = 0
+                    continue
+                row[j] = score
+                if score == match_mismatch:
+                    row_directions[j] = DIAGONAL
+                elif score == vertical[j]:
+                    row_directions[j] = UP
+                else:
+                    row_directions[j] = LEFT
+                if score > max_value:
+                    max_value = score
+                    max_pos = (i, j)
+            if keep_pointers:
+                directions.set_row(i, row_directions)
+                flags.set_row(i, row_flags)
+            prev_row = row
+            prev_vertical = vertical
+
+        if local:
+            return directions, flags, max_pos, max_value
+        return directions, flags, (len(seq1), len(seq2)), prev_row[cols - 1]
+
+    def affine_traceback(self, seq1, seq2, directions, flags, start):
+        """
+        Traceback de Gotoh: dentro de un gap se sigue en E o F mientras el bit de extensión esté encendido
+        """
+        aligned_seq1 = []
+        aligned_seq2 = []
+        i, j = start
+        state = None
+
+        while True:
+            if state is None:
+                state = directions.get(i, j)
+                if state == STOP:
+                    break
+                if state == DIAGONAL:
+                    aligned_seq1.append(seq1[i-1])
+                    aligned_seq2.append(seq2[j-1])
+                    i -= 1
+                    j -= 1
+                    state = None
+                continue
+
+            extend = flags.get(i, j) & (1 if state == UP else 2)
+            if state == UP:
+                aligned_seq1.append(seq1[i-1])
+                aligned_seq2.append('-')
+                i -= 1
+            else:
+                aligned_seq1.append('-')
+                aligned_seq2.append(seq2[j-1])
+                j -= 1
+            if not extend:
+                state = None
+
+        return ''.join(reversed(aligned_seq1)), ''.join(reversed(aligned_seq2))
+
+    def affine_alignment(self, seq1, seq2, mode, local=False):
+        """
+        Alineamiento con gaps afines; solo admite los modos "matrix" y "pointers"
+        (ambos usan filas rotativas y punteros empaquetados). Devuelve las direcciones como matriz.
+        """
+        if mode not in ("matrix", "pointers"):
+            raise ValueError(f"El modo {mode} no admite gaps afines")
+
+        directions, flags, start, score = self.run_phase("fill_affine", self.fill_affine, seq1, seq2, local)
+        aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.affine_traceback,
+                                                    seq1, seq2, directions, flags, start)
+        return aligned_seq1, aligned_seq2, score, directions
+
     def validate_seqs(self, seq1, seq2, seq_type=None):
         if not seq1 or not seq2:
             raise ValueError("Las secuencias no pueden estar vacías.")
@@ -61,6 +519,26 @@ class NeedlemanWunsch(AlgoritmoAlineamiento):
         return matrix
 
 
+    def initialize_compact(self, seq1, seq2, path=None):
+        """
+        Igual que initialize_matrix, sobre una MatrizCompacta (en memoria o en el archivo path)
+        """
+        matrix = MatrizCompacta(len(seq1) + 1, len(seq2) + 1, path=path)
+        first_row = matrix[0]
+        for j in range(len(seq2) + 1):
+            first_row[j] = self.gap * j
+        for i in range(len(seq1) + 1):
+            matrix[i][0] = self.gap * i
+        return matrix
+
+
+    def compact_view(self, matrix):
+        """
+        Matriz sobre la que trabajan fill_matrix y traceback en el modo compacto
+        """
+        return matrix
+
+
     def fill_matrix(self, matrix, seq1, seq2):
         """
         Calcular el máximo de
@@ -68,9 +546,11 @@ class NeedlemanWunsch(AlgoritmoAlineamiento):
         - gap horizontal
         - match/mismatch diagonal
         """
+        codes1, codes2, table = self.score_table(seq1, seq2)
         for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
             for j in range(1, len(seq2) + 1):
-                match_mismatch = matrix[i-1][j-1] + self.calculate_score(seq1[i-1], seq2[j-1])
+                match_mismatch = matrix[i-1][j-1] + scores[codes2[j-1]]
                 gap_vertical = matrix[i-1][j] + self.gap
                 gap_horizontal = matrix[i][j-1] + self.gap
 
@@ -126,18 +606,374 @@ class NeedlemanWunsch(AlgoritmoAlineamiento):
         return ''.join(reversed(aligned_seq1)), ''.join(reversed(aligned_seq2))
     
 
-    def alignment(self, seq1, seq2):
+    def fill_rows(self, seq1, seq2, first_row, first_col):
+        """
+        Genera las filas 1..len(seq1) de la matriz manteniendo solo la fila anterior.
+        - first_row: valores de la fila 0
+        - first_col: valores de la columna 0
+        """
+        prev_row = first_row
+
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
+            row = [first_col[i]] + [0] * len(seq2)
+            for j in range(1, len(seq2) + 1):
+                match_mismatch = prev_row[j-1] + scores[codes2[j-1]]
+                gap_vertical = prev_row[j] + self.gap
+                gap_horizontal = row[j-1] + self.gap
+
+                row[j] = max(match_mismatch, gap_vertical, gap_horizontal)
+            yield row
+            prev_row = row
+
+
+    def last_row(self, seq1, seq2):
+        """
+        Calcula solo la última fila de la matriz (memoria O(len(seq2)))
+        """
+        row = [self.gap * j for j in range(len(seq2) + 1)]
+        first_col = [self.gap * i for i in range(len(seq1) + 1)]
+        for row in self.fill_rows(seq1, seq2, row, first_col):
+            pass
+        return row
+
+
+    def hirschberg(self, seq1, seq2):
+        """
+        Alineamiento global en memoria lineal (Hirschberg).
+        Devuelve exactamente el mismo alineamiento que traceback.
+        """
+        aligned_seq1 = []
+        aligned_seq2 = []
+        first_row = [self.gap * j for j in range(len(seq2) + 1)]
+        first_col = [self.gap * i for i in range(len(seq1) + 1)]
+
+        j = self._hirschberg_walk(seq1, seq2, first_row, first_col, aligned_seq1, aligned_seq2)
+
+        # Primera fila, solo hacia izquierda <
+        for j in range(j, 0, -1):
+            aligned_seq1.append('-')
+            aligned_seq2.append(seq2[j-1])
+
+        return ''.join(reversed(aligned_seq1)), ''.join(reversed(aligned_seq2))
+
+
+    def _hirschberg_walk(self, seq1, seq2, first_row, first_col, aligned_seq1, aligned_seq2):
+        """
+        Recorre el mismo camino que traceback desde la esquina inferior derecha
+        de la región hasta llegar a su fila 0, y devuelve la columna de llegada.
+        - first_row / first_col: valores globales del borde superior e izquierdo
+        - se parte la región por la fila media; el camino solo puede cruzarla en
+          celdas de algún camino óptimo (prefijo + sufijo == óptimo), así que la
+          mitad inferior empieza en la primera de esas columnas
+        """
+        rows = len(seq1)
+        cols = len(seq2)
+
+        if rows <= 1 or cols <= 1:
+            # Caso base: la región completa ocupa O(len(seq1) + len(seq2))
+            matrix = [first_row] + list(self.fill_rows(seq1, seq2, first_row, first_col))
+            i, j = rows, cols
+            while i > 0:
+                if j == 0:
+                    aligned_seq1.append(seq1[i-1])
+                    aligned_seq2.append('-')
+                    i -= 1
+                    continue
+
+                score_current = matrix[i][j]
+                if score_current == matrix[i-1][j-1] + self.calculate_score(seq1[i-1], seq2[j-1]):
+                    aligned_seq1.append(seq1[i-1])
+                    aligned_seq2.append(seq2[j-1])
+                    i -= 1
+                    j -= 1
+                elif score_current == matrix[i-1][j] + self.gap:
+                    aligned_seq1.append(seq1[i-1])
+                    aligned_seq2.append('-')
+                    i -= 1
+                else:
+                    aligned_seq1.append('-')
+                    aligned_seq2.append(seq2[j-1])
+                    j -= 1
+            return j
+
+        mid = rows // 2
+        suffix = self.last_row(seq1[mid:][::-1], seq2[::-1])
+
+        # Fila media, primera columna óptima y columna de borde de la mitad inferior
+        mid_row = None
+        split = 0
+        split_col = []
+        for i, row in enumerate(self.fill_rows(seq1, seq2, first_row, first_col), start=1):
+            if i == mid:
+                totals = [row[j] + suffix[cols - j] for j in range(cols + 1)]
+                split = totals.index(max(totals))
+                mid_row = row[split:]
+                split_col.append(row[split])
+            elif i > mid:
+                split_col.append(row[split])
+        del suffix
+
+        j = self._hirschberg_walk(seq1[mid:], seq2[split:], mid_row, split_col,
+                                  aligned_seq1, aligned_seq2)
+        enter = split + j
+        return self._hirschberg_walk(seq1[:mid], seq2[:enter], first_row[:enter + 1],
+                                     first_col[:mid + 1], aligned_seq1, aligned_seq2)
+
+
+    def fill_pointers(self, seq1, seq2):
+        """
+        Llena la matriz con dos filas rotativas y guarda solo la dirección de cada celda.
+        - misma prioridad que traceback: diagonal, arriba, izquierda
+        - devuelve (punteros, puntuación)
+        """
+        pointers = MatrizPunteros(len(seq1) + 1, len(seq2) + 1)
+        pointers.set_row(0, [STOP] + [LEFT] * len(seq2))
+        prev_row = [self.gap * j for j in range(len(seq2) + 1)]
+
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
+            row = [self.gap * i] + [0] * len(seq2)
+            directions = [UP] + [STOP] * len(seq2)
+            for j in range(1, len(seq2) + 1):
+                match_mismatch = prev_row[j-1] + scores[codes2[j-1]]
+                gap_vertical = prev_row[j] + self.gap
+                gap_horizontal = row[j-1] + self.gap
+
+                score = max(match_mismatch, gap_vertical, gap_horizontal)
+                row[j] = score
+                if score == match_mismatch:
+                    directions[j] = DIAGONAL
+                elif score == gap_vertical:
+                    directions[j] = UP
+                else:
+                    directions[j] = LEFT
+            pointers.set_row(i, directions)
+            prev_row = row
+        return pointers, prev_row[len(seq2)]
+
+
+    def score_only(self, seq1, seq2):
+        """
+        Devuelve solo la puntuación óptima, sin matriz ni traceback.
+        - dos filas rotativas sobre la secuencia más corta: memoria O(min(n, m))
+        """
+        self.validate_seqs(seq1, seq2)
+
+        if len(seq2) > len(seq1):
+            seq1, seq2 = seq2, seq1
+        if self.affine:
+            return self.fill_affine(seq1, seq2, keep_pointers=False)[3]
+        return self.last_row(seq1, seq2)[len(seq2)]
+
+
+    def fill_band(self, seq1, seq2, lo, hi):
+        """
+        Llena solo las celdas con lo <= j - i <= hi (tiempo y memoria O((n + m) * k)).
+        Devuelve la MatrizBanda.
+        """
+        band = MatrizBanda(len(seq1) + 1, len(seq2) + 1, lo, hi)
+        start, end = band.row_range(0)
+        band.data.append([self.gap * j for j in range(start, end + 1)])
+
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
+            prev_row, prev_start, prev_end = band.data[i-1], start, end
+            start, end = band.row_range(i)
+            row = []
+            for j in range(start, end + 1):
+                if j == 0:
+                    row.append(self.gap * i)
+                    continue
+
+                # Vecinos fuera de la banda no cuentan
+                best = float('-inf')
+                if prev_start <= j - 1 <= prev_end:
+                    best = prev_row[j - 1 - prev_start] + scores[codes2[j-1]]
+                if j <= prev_end:
+                    best = max(best, prev_row[j - prev_start] + self.gap)
+                if j > start:
+                    best = max(best, row[-1] + self.gap)
+                row.append(best)
+            band.data.append(row)
+        return band
+
+
+    def band_traceback(self, seq1, seq2, band):
+        """
+        Mismo recorrido que traceback, leyendo las celdas de la banda
+        """
+        aligned_seq1 = []
+        aligned_seq2 = []
+        i, j = len(seq1), len(seq2)
+
+        while i > 0 or j > 0:
+            if i > 0 and j == 0:
+                aligned_seq1.append(seq1[i-1])
+                aligned_seq2.append('-')
+                i -= 1
+            elif j > 0 and i == 0:
+                aligned_seq1.append('-')
+                aligned_seq2.append(seq2[j-1])
+                j -= 1
+            else:
+                score_current = band.get(i, j)
+                if score_current == band.get(i-1, j-1) + self.calculate_score(seq1[i-1], seq2[j-1]):
+                    aligned_seq1.append(seq1[i-1])
+                    aligned_seq2.append(seq2[j-1])
+                    i -= 1
+                    j -= 1
+                elif score_current == band.get(i-1, j) + self.gap:
+                    aligned_seq1.append(seq1[i-1])
+                    aligned_seq2.append('-')
+                    i -= 1
+                else:
+                    aligned_seq1.append('-')
+                    aligned_seq2.append(seq2[j-1])
+                    j -= 1
+
+        return ''.join(reversed(aligned_seq1)), ''.join(reversed(aligned_seq2))
+
+
+    def band_bound(self, seq1, seq2, lo, hi):
+        """
+        Cota superior de la puntuación de cualquier camino que salga de la banda.
+        - salir por la diagonal t exige al menos |t| + |d - t| gaps (d = m - n)
+        - con g gaps hay (n + m - g) / 2 pares, cada uno a lo sumo el mejor par posible
+        Devuelve -infinito si ningún camino puede salir de la banda.
+        """
+        n, m = len(seq1), len(seq2)
+        d = m - n
+        exits = []
+        if hi + 1 <= m:
+            exits.append(2 * (hi + 1) - d)
+        if lo - 1 >= -n:
+            exits.append(d - 2 * (lo - 1))
+        if not exits:
+            return float('-inf')
+
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        best_pair = max(table[a][b] for a in set(codes1) for b in set(codes2))
+
+        # La cota es lineal en g: basta evaluar los extremos
+        return max((n + m - gaps) / 2 * best_pair + gaps * self.gap
+                   for gaps in (min(exits), n + m))
+
+
+    def banded(self, seq1, seq2, band=8):
+        """
+        Alineamiento global restringido a una banda alrededor de la diagonal.
+        - la banda cubre las diagonales entre 0 y m - n, más band a cada lado
+        - si algún camino fuera de la banda pudiera empatar o superar la
+          puntuación obtenida (band_bound), se duplica band y se repite
+        Devuelve (alineada1, alineada2, puntuación, MatrizBanda); igual que traceback.
+        """
+        d = len(seq2) - len(seq1)
+        while True:
+            lo, hi = min(0, d) - band, max(0, d) + band
+            matrix = self.run_phase("fill_band", self.fill_band, seq1, seq2, lo, hi)
+            score = matrix.get(len(seq1), len(seq2))
+            if matrix.covers_all() or score > self.band_bound(seq1, seq2, lo, hi):
+                break
+            band *= 2
+            if self.metrics is not None:
+                self.metrics.count("band_widenings")
+
+        aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.band_traceback, seq1, seq2, matrix)
+        return aligned_seq1, aligned_seq2, score, matrix
+
+
+    def compact_alignment(self, seq1, seq2, path=None):
+        """
+        Igual que el modo "matrix", con la matriz en un búfer plano (MatrizCompacta):
+        4 bytes por celda, o en el archivo path mapeado con mmap para matrices enormes.
+        """
+        matrix = self.run_phase("initialize_matrix", self.initialize_compact, seq1, seq2, path)
+        view = self.compact_view(matrix)
+        self.run_phase("fill_matrix", self.fill_matrix, view, seq1, seq2)
+        aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.traceback, seq1, seq2, view)
+        score = matrix[len(seq1)][len(seq2)]
+        del view
+        return aligned_seq1, aligned_seq2, score, matrix
+
+
+    def alignment(self, seq1, seq2, mode="matrix"):
         """
         Ejecuta el alineamiento completo
+        - mode="matrix": matriz completa y traceback
+        - mode="linear": Hirschberg en memoria lineal, no devuelve matriz (None)
+        - mode="pointers": direcciones a 2 bits por celda, devuelve MatrizPunteros
+        - mode="banded": solo una banda alrededor de la diagonal que se ensancha
+          hasta garantizar el óptimo, devuelve MatrizBanda
+        - mode="parallel": bloques por frente de onda en todos los núcleos
+          (paralelo.parallel_alignment), no devuelve matriz (None)
+        - mode="compact": matriz completa en un búfer plano, devuelve MatrizCompacta
+          (compact_alignment con path para mapearla a un archivo)
+        - mode="anchors": coincidencias exactas encadenadas y DP solo entre ellas
+          (anclas.anchor_alignment), para secuencias largas y emparentadas; no devuelve matriz (None)
+        Con gaps afines (gap_open / gap_extend) se usa Gotoh (affine_alignment; en
+        mode="anchors", entre las anclas).
         """
         self.validate_seqs(seq1, seq2)
 
-        matrix = self.initialize_matrix(seq1, seq2)
-        matrix = self.fill_matrix(matrix, seq1, seq2)
-        aligned_seq1, aligned_seq2 = self.traceback(seq1, seq2, matrix)
+        if mode == "anchors":
+            from .anclas import anchor_alignment
+            return self.record_alignment(seq1, seq2, self.run_phase("anchors", anchor_alignment, self, seq1, seq2))
+
+        if self.affine:
+            return self.record_alignment(seq1, seq2, self.affine_alignment(seq1, seq2, mode))
+
+        if mode == "compact":
+            return self.record_alignment(seq1, seq2, self.compact_alignment(seq1, seq2))
+
+        if mode == "linear":
+            aligned_seq1, aligned_seq2 = self.run_phase("hirschberg", self.hirschberg, seq1, seq2)
+            score = self.score_alignment(aligned_seq1, aligned_seq2)
+            return self.record_alignment(seq1, seq2, (aligned_seq1, aligned_seq2, score, None))
+
+        if mode == "banded":
+            return self.record_alignment(seq1, seq2, self.banded(seq1, seq2))
+
+        if mode == "parallel":
+            from .paralelo import parallel_alignment
+            return self.record_alignment(seq1, seq2, self.run_phase("parallel", parallel_alignment, self, seq1, seq2))
+
+        if mode == "pointers":
+            pointers, score = self.run_phase("fill_pointers", self.fill_pointers, seq1, seq2)
+            aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.pointer_traceback,
+                                                        seq1, seq2, pointers, (len(seq1), len(seq2)))
+            return self.record_alignment(seq1, seq2, (aligned_seq1, aligned_seq2, score, pointers))
+
+        if mode != "matrix":
+            raise ValueError(f"Modo de alineamiento desconocido: {mode}")
+
+        matrix = self.run_phase("initialize_matrix", self.initialize_matrix, seq1, seq2)
+        matrix = self.run_phase("fill_matrix", self.fill_matrix, matrix, seq1, seq2)
+        aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.traceback, seq1, seq2, matrix)
         score = matrix[len(seq1)][len(seq2)]
 
-        return aligned_seq1, aligned_seq2, score, matrix
+        return self.record_alignment(seq1, seq2, (aligned_seq1, aligned_seq2, score, matrix))
+
+
+    def cigar_alignment(self, seq1, seq2, mode="pointers"):
+        """
+        Como alignment(), pero con el alineamiento en tramos: (AlineamientoCigar, puntuación, matriz)
+        - mode="pointers" con gap lineal: los tramos salen directamente de las direcciones,
+          sin construir las cadenas con gaps
+        - cualquier otro modo: las cadenas de alignment(mode) se convierten en tramos
+        """
+        if mode != "pointers" or self.affine:
+            aligned_seq1, aligned_seq2, score, matrix = self.alignment(seq1, seq2, mode)
+            return AlineamientoCigar.from_strings(aligned_seq1, aligned_seq2), score, matrix
+
+        self.validate_seqs(seq1, seq2)
+        pointers, score = self.run_phase("fill_pointers", self.fill_pointers, seq1, seq2)
+        cigar = self.run_phase("traceback", self.pointer_cigar, seq1, seq2, pointers, (len(seq1), len(seq2)))
+        self.record_alignment(seq1, seq2, (cigar, None, score, pointers))
+        return cigar, score, pointers
 
 
 # ===============================================================================
@@ -154,15 +990,31 @@ class SmithWaterman(AlgoritmoAlineamiento):
         cols = len(seq2) + 1
         matrix = [[0 for _ in range(cols)] for _ in range(rows)]
         return matrix
+
+
+    def initialize_compact(self, seq1, seq2, path=None):
+        """
+        Igual que initialize_matrix, sobre una MatrizCompacta (ya viene en ceros)
+        """
+        return MatrizCompacta(len(seq1) + 1, len(seq2) + 1, path=path)
+
+
+    def compact_view(self, matrix):
+        """
+        Matriz sobre la que trabajan fill_matrix, find_max y traceback en el modo compacto
+        """
+        return matrix
     
 
     def fill_matrix(self, matrix, seq1, seq2):
         """
         Si el valor es negativo, se coloca 0
         """
+        codes1, codes2, table = self.score_table(seq1, seq2)
         for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
             for j in range(1, len(seq2) + 1):
-                match_mismatch = matrix[i-1][j-1] + self.calculate_score(seq1[i-1], seq2[j-1])
+                match_mismatch = matrix[i-1][j-1] + scores[codes2[j-1]]
                 gap_vertical = matrix[i-1][j] + self.gap
                 gap_horizontal = matrix[i][j-1] + self.gap
                 
@@ -172,6 +1024,47 @@ class SmithWaterman(AlgoritmoAlineamiento):
         return matrix
     
 
+    def fill_rows(self, seq1, seq2, first_row=None, first_col=None):
+        """
+        Genera las filas 1..len(seq1) de la matriz manteniendo solo la fila anterior
+        - first_row / first_col: valores de la fila 0 y la columna 0 (por defecto, ceros);
+          los bloques del modo paralelo empiezan desde los bordes de sus vecinos
+        """
+        prev_row = first_row if first_row is not None else [0] * (len(seq2) + 1)
+
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
+            row = [first_col[i] if first_col is not None else 0] + [0] * len(seq2)
+            for j in range(1, len(seq2) + 1):
+                match_mismatch = prev_row[j-1] + scores[codes2[j-1]]
+                gap_vertical = prev_row[j] + self.gap
+                gap_horizontal = row[j-1] + self.gap
+
+                row[j] = max(match_mismatch, gap_vertical, gap_horizontal, 0)
+            yield row
+            prev_row = row
+
+
+    def score_only(self, seq1, seq2):
+        """
+        Devuelve solo la puntuación local máxima, sin matriz, traceback ni find_max.
+        - el máximo se acumula durante el llenado
+        - dos filas rotativas sobre la secuencia más corta: memoria O(min(n, m))
+        """
+        self.validate_seqs(seq1, seq2)
+
+        if len(seq2) > len(seq1):
+            seq1, seq2 = seq2, seq1
+        if self.affine:
+            return self.fill_affine(seq1, seq2, local=True, keep_pointers=False)[3]
+
+        max_value = 0
+        for row in self.fill_rows(seq1, seq2):
+            max_value = max(max_value, max(row))
+        return max_value
+
+
     def find_max(self, matrix):
         """
         Encuentra la posición del valor máximo en la matriz
@@ -222,16 +1115,248 @@ class SmithWaterman(AlgoritmoAlineamiento):
         return ''.join(reversed(aligned_seq1)), ''.join(reversed(aligned_seq2))
 
 
-    def alignment(self, seq1, seq2):
+    def anchored_rows(self, seq1, seq2):
+        """
+        Genera las filas de una matriz anclada en (0, 0): recurrencia global, sin máximo con 0
+        """
+        prev_row = [self.gap * j for j in range(len(seq2) + 1)]
+
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
+            row = [self.gap * i] + [0] * len(seq2)
+            for j in range(1, len(seq2) + 1):
+                match_mismatch = prev_row[j-1] + scores[codes2[j-1]]
+                gap_vertical = prev_row[j] + self.gap
+                gap_horizontal = row[j-1] + self.gap
+
+                row[j] = max(match_mismatch, gap_vertical, gap_horizontal)
+            yield row
+            prev_row = row
+
+
+    def fill_pointers(self, seq1, seq2):
+        """
+        Llena la matriz con dos filas rotativas y guarda solo la dirección de cada celda.
+        - las celdas con 0 quedan como STOP (fin del traceback)
+        - el máximo se acumula durante el llenado
+        - devuelve (punteros, posición del máximo, máximo)
+        """
+        pointers = MatrizPunteros(len(seq1) + 1, len(seq2) + 1)
+        prev_row = [0] * (len(seq2) + 1)
+        max_value = 0
+        max_pos = (0, 0)
+
+        codes1, codes2, table = self.score_table(seq1, seq2)
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1]]
+            row = [0] * (len(seq2) + 1)
+            directions = [STOP] * (len(seq2) + 1)
+            for j in range(1, len(seq2) + 1):
+                match_mismatch = prev_row[j-1] + scores[codes2[j-1]]
+                gap_vertical = prev_row[j] + self.gap
+                gap_horizontal = row[j-1] + self.gap
+
+                score = max(match_mismatch, gap_vertical, gap_horizontal, 0)
+                row[j] = score
+                if score == 0:
+                    continue
+                if score == match_mismatch:
+                    directions[j] = DIAGONAL
+                elif score == gap_vertical:
+                    directions[j] = UP
+                else:
+                    directions[j] = LEFT
+                if score > max_value:
+                    max_value = score
+                    max_pos = (i, j)
+            pointers.set_row(i, directions)
+            prev_row = row
+        return pointers, max_pos, max_value
+
+
+    def compact_alignment(self, seq1, seq2, path=None):
+        """
+        Igual que el modo "matrix", con la matriz en un búfer plano (MatrizCompacta):
+        4 bytes por celda, o en el archivo path mapeado con mmap para matrices enormes.
+        """
+        matrix = self.run_phase("initialize_matrix", self.initialize_compact, seq1, seq2, path)
+        view = self.compact_view(matrix)
+        self.run_phase("fill_matrix", self.fill_matrix, view, seq1, seq2)
+        aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.traceback, seq1, seq2, view)
+        _, score = self.run_phase("find_max", self.find_max, view)
+        del view
+        return aligned_seq1, aligned_seq2, int(score), matrix
+
+
+    def find_end(self, seq1, seq2):
+        """
+        Pasada hacia adelante sin matriz: posición y valor del máximo.
+        - misma posición que find_max (primera en orden de filas)
+        """
+        max_value = 0
+        max_pos = (0, 0)
+
+        for i, row in enumerate(self.fill_rows(seq1, seq2), start=1):
+            row_max = max(row)
+            if row_max > max_value:
+                max_value = row_max
+                max_pos = (i, row.index(row_max))
+        return max_pos, max_value
+
+
+    def find_start(self, seq1, seq2, max_pos, max_value):
+        """
+        Pasada inversa desde el máximo sobre los prefijos invertidos.
+        Devuelve la esquina superior izquierda más lejana desde la que un
+        alineamiento termina en max_pos con puntuación max_value.
+        """
+        i_end, j_end = max_pos
+        rows_back = 0
+        cols_back = 0
+
+        for r, row in enumerate(self.anchored_rows(seq1[:i_end][::-1], seq2[:j_end][::-1]), start=1):
+            for c in range(len(row) - 1, cols_back, -1):
+                if row[c] == max_value:
+                    cols_back = c
+                    break
+            if max_value in row:
+                rows_back = r
+        return i_end - rows_back, j_end - cols_back
+
+
+    def linear_traceback(self, seq1, seq2):
+        """
+        Alineamiento local sin la matriz completa.
+        - pasada hacia adelante: posición del máximo
+        - pasada inversa: inicio más lejano posible del alineamiento
+        - solo se guarda la ventana entre ambos puntos y se hace traceback en ella
+        Devuelve el mismo alineamiento que traceback con memoria O(m + ventana²):
+        (alineada1, alineada2, puntuación, posición del máximo).
+        """
+        max_pos, max_value = self.find_end(seq1, seq2)
+        if max_value == 0:
+            return '', '', 0, max_pos
+
+        i_end, j_end = max_pos
+        i_start, j_start = self.find_start(seq1, seq2, max_pos, max_value)
+
+        # Una fila/columna extra para que el traceback no se detenga en el borde de la ventana
+        i_start = max(i_start - 1, 0)
+        j_start = max(j_start - 1, 0)
+
+        window = [[0] * (j_end - j_start + 1)] if i_start == 0 else []
+        for i, row in enumerate(self.fill_rows(seq1[:i_end], seq2[:j_end]), start=1):
+            if i >= i_start:
+                window.append(list(row[j_start:]))
+
+        aligned_seq1, aligned_seq2 = self.traceback(seq1[i_start:i_end], seq2[j_start:j_end], window)
+        return aligned_seq1, aligned_seq2, max_value, max_pos
+
+
+    def alignment(self, seq1, seq2, mode="matrix"):
         """
         Ejecuta el alineamiento local completo
+        - mode="matrix": matriz completa, traceback y find_max
+        - mode="linear": sin matriz completa (ver linear_traceback), devuelve None como matriz
+        - mode="pointers": direcciones a 2 bits por celda, devuelve MatrizPunteros
+        - mode="parallel": bloques por frente de onda en todos los núcleos
+          (paralelo.parallel_alignment), no devuelve matriz (None)
+        - mode="compact": matriz completa en un búfer plano, devuelve MatrizCompacta
+          (compact_alignment con path para mapearla a un archivo)
+        Con gaps afines (gap_open / gap_extend) se usa Gotoh (affine_alignment).
         """
         self.validate_seqs(seq1, seq2)
+
+        if self.affine:
+            return self.record_alignment(seq1, seq2, self.affine_alignment(seq1, seq2, mode, local=True))
+
+        if mode == "compact":
+            return self.record_alignment(seq1, seq2, self.compact_alignment(seq1, seq2))
+
+        if mode == "parallel":
+            from .paralelo import parallel_alignment
+            return self.record_alignment(seq1, seq2, self.run_phase("parallel", parallel_alignment, self, seq1, seq2))
+
+        if mode == "linear":
+            aligned_seq1, aligned_seq2, score, _ = self.run_phase("linear_traceback", self.linear_traceback,
+                                                                  seq1, seq2)
+            return self.record_alignment(seq1, seq2, (aligned_seq1, aligned_seq2, score, None))
+
+        if mode == "pointers":
+            pointers, max_pos, score = self.run_phase("fill_pointers", self.fill_pointers, seq1, seq2)
+            aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.pointer_traceback,
+                                                        seq1, seq2, pointers, max_pos)
+            return self.record_alignment(seq1, seq2, (aligned_seq1, aligned_seq2, score, pointers))
+
+        if mode != "matrix":
+            raise ValueError(f"Modo de alineamiento desconocido: {mode}")
+
+        matrix = self.run_phase("initialize_matrix", self.initialize_matrix, seq1, seq2)
+        matrix = self.run_phase("fill_matrix", self.fill_matrix, matrix, seq1, seq2)
+        aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.traceback, seq1, seq2, matrix)
         
-        matrix = self.initialize_matrix(seq1, seq2)
-        matrix = self.fill_matrix(matrix, seq1, seq2)
-        aligned_seq1, aligned_seq2 = self.traceback(seq1, seq2, matrix)
-        
-        _, score = self.find_max(matrix)
+        _, score = self.run_phase("find_max", self.find_max, matrix)
         
-        return aligned_seq1, aligned_seq2, score, matrix
+        return self.record_alignment(seq1, seq2, (aligned_seq1, aligned_seq2, score, matrix))
+
+
+    def cigar_alignment(self, seq1, seq2, mode="pointers"):
+        """
+        Como alignment(), pero con el alineamiento en tramos: (AlineamientoCigar, puntuación, matriz)
+        - mode="pointers" con gap lineal: los tramos salen directamente de las direcciones,
+          sin construir las cadenas con gaps
+        - mode="matrix", "linear", "compact", "parallel" o gaps afines (solo "matrix" y
+          "pointers"): las cadenas del traceback se convierten en tramos, que empiezan
+          donde termina el alineamiento (celda del máximo) menos su largo
+        """
+        self.validate_seqs(seq1, seq2)
+
+        if self.affine:
+            if mode not in ("matrix", "pointers"):
+                raise ValueError(f"El modo {mode} no admite gaps afines")
+            directions, flags, start, score = self.run_phase("fill_affine", self.fill_affine, seq1, seq2, True)
+            aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.affine_traceback,
+                                                        seq1, seq2, directions, flags, start)
+            matrix = directions
+            cigar = self.strings_cigar(aligned_seq1, aligned_seq2, start)
+
+        elif mode == "pointers":
+            pointers, max_pos, score = self.run_phase("fill_pointers", self.fill_pointers, seq1, seq2)
+            cigar = self.run_phase("traceback", self.pointer_cigar, seq1, seq2, pointers, max_pos)
+            matrix = pointers
+
+        elif mode == "matrix":
+            matrix = self.run_phase("initialize_matrix", self.initialize_matrix, seq1, seq2)
+            matrix = self.run_phase("fill_matrix", self.fill_matrix, matrix, seq1, seq2)
+            max_pos, score = self.run_phase("find_max", self.find_max, matrix)
+            aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.traceback, seq1, seq2, matrix)
+            cigar = self.strings_cigar(aligned_seq1, aligned_seq2, max_pos)
+
+        elif mode == "linear":
+            aligned_seq1, aligned_seq2, score, max_pos = self.run_phase("linear_traceback", self.linear_traceback,
+                                                                        seq1, seq2)
+            matrix = None
+            cigar = self.strings_cigar(aligned_seq1, aligned_seq2, max_pos)
+
+        elif mode == "compact":
+            matrix = self.run_phase("initialize_matrix", self.initialize_compact, seq1, seq2)
+            view = self.compact_view(matrix)
+            self.run_phase("fill_matrix", self.fill_matrix, view, seq1, seq2)
+            max_pos, score = self.run_phase("find_max", self.find_max, view)
+            aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.traceback, seq1, seq2, view)
+            del view
+            cigar = self.strings_cigar(aligned_seq1, aligned_seq2, max_pos)
+
+        elif mode == "parallel":
+            from .paralelo import parallel_traceback
+            aligned_seq1, aligned_seq2, score, max_pos = self.run_phase("parallel", parallel_traceback,
+                                                                        self, seq1, seq2)
+            matrix = None
+            cigar = self.strings_cigar(aligned_seq1, aligned_seq2, max_pos)
+
+        else:
+            raise ValueError(f"Modo de alineamiento desconocido: {mode}")
+
+        self.record_alignment(seq1, seq2, (cigar, None, score, matrix))
+        return cigar, score, matrix
@@ -0,0 +1,131 @@
+from bisect import bisect_left
+
+from .heuristica import kmer_codes
+
+
+def unique_kmers(seq, k, alphabet):
+    """
+    Código -> posición de cada k-mer que aparece una sola vez en seq
+    """
+    positions = {}
+    for pos, code in kmer_codes(seq, k, alphabet):
+        positions[code] = -1 if code in positions else pos
+    return {code: pos for code, pos in positions.items() if pos >= 0}
+
+
+def find_anchors(seq1, seq2, k):
+    """
+    Coincidencias exactas únicas entre ambas secuencias: k-mers que aparecen una sola
+    vez en cada una, unidos en un tramo cuando se solapan en la misma diagonal.
+    Devuelve (i, j, largo) ordenados por i.
+    """
+    alphabet = sorted(set(seq1.upper()) | set(seq2.upper()))
+    unique1 = unique_kmers(seq1, k, alphabet)
+    unique2 = unique_kmers(seq2, k, alphabet)
+
+    anchors = []
+    for i, j in sorted((i, unique2[code]) for code, i in unique1.items() if code in unique2):
+        if anchors:
+            prev_i, prev_j, length = anchors[-1]
+            if i - prev_i == j - prev_j and i <= prev_i + length - k + 1:
+                anchors[-1] = (prev_i, prev_j, i + k - prev_i)
+                continue
+        anchors.append((i, j, k))
+    return anchors
+
+
+def chain_anchors(anchors):
+    """
+    Cadena más larga de anclas crecientes en ambas secuencias: subsecuencia creciente
+    más larga sobre j con las anclas ordenadas por i, O(a log a).
+    Los solapamientos entre anclas vecinas se recortan del inicio de la siguiente.
+    """
+    tails = []
+    tails_j = []
+    previous = [None] * len(anchors)
+    for index, (_, j, _) in enumerate(anchors):
+        pos = bisect_left(tails_j, j)
+        previous[index] = tails[pos - 1] if pos else None
+        if pos == len(tails):
+            tails.append(index)
+            tails_j.append(j)
+        else:
+            tails[pos] = index
+            tails_j[pos] = j
+
+    chain = []
+    index = tails[-1] if tails else None
+    while index is not None:
+        chain.append(anchors[index])
+        index = previous[index]
+
+    result = []
+    end1 = end2 = 0
+    for i, j, length in reversed(chain):
+        cut = max(end1 - i, end2 - j, 0)
+        if length > cut:
+            i, j, length = i + cut, j + cut, length - cut
+            result.append((i, j, length))
+            end1, end2 = i + length, j + length
+    return result
+
+
+def _align_gap(aligner, seq1, seq2):
+    """
+    Programación dinámica completa (punteros de 2 bits) de un tramo entre anclas
+    """
+    if not seq1 or not seq2:
+        return seq1 + '-' * len(seq2), '-' * len(seq1) + seq2
+    if aligner.affine:
+        directions, flags, start, _ = aligner.fill_affine(seq1, seq2)
+        return aligner.affine_traceback(seq1, seq2, directions, flags, start)
+    pointers, _ = aligner.fill_pointers(seq1, seq2)
+    return aligner.pointer_traceback(seq1, seq2, pointers, (len(seq1), len(seq2)))
+
+
+def _align_region(aligner, seq1, seq2, k, min_k, max_cells, aligned_seq1, aligned_seq2):
+    """
+    Alinea un tramo: con DP si es pequeño (o ya no quedan k por probar); si no,
+    lo parte por sus anclas y alinea cada hueco entre ellas de la misma forma
+    """
+    anchors = []
+    while len(seq1) * len(seq2) > max_cells and k >= min_k and not anchors:
+        anchors = chain_anchors(find_anchors(seq1, seq2, k))
+        if not anchors:
+            k //= 2
+
+    if not anchors:
+        gap1, gap2 = _align_gap(aligner, seq1, seq2)
+        aligned_seq1.append(gap1)
+        aligned_seq2.append(gap2)
+        return
+
+    i = j = 0
+    for anchor_i, anchor_j, length in anchors:
+        _align_region(aligner, seq1[i:anchor_i], seq2[j:anchor_j], k, min_k, max_cells,
+                      aligned_seq1, aligned_seq2)
+        aligned_seq1.append(seq1[anchor_i:anchor_i + length])
+        aligned_seq2.append(seq2[anchor_j:anchor_j + length])
+        i, j = anchor_i + length, anchor_j + length
+    _align_region(aligner, seq1[i:], seq2[j:], k, min_k, max_cells, aligned_seq1, aligned_seq2)
+
+
+def anchor_alignment(aligner, seq1, seq2, k=20, min_k=8, max_cells=250000):
+    """
+    Alineamiento global por anclas, para secuencias largas y emparentadas (NW):
+    - anclas: k-mers únicos en ambas secuencias, unidos en coincidencias exactas
+    - se encadenan con chain_anchors y los huecos entre anclas consecutivas se
+      alinean con DP si tienen hasta max_cells celdas; si no, se vuelven a partir
+      con sus propias anclas (k a la mitad cuando no aparece ninguna, hasta min_k)
+    Tiempo casi lineal cuando las secuencias se parecen; la DP exacta queda para
+    las regiones divergentes. El resultado es un alineamiento global válido, óptimo
+    solo si el camino óptimo pasa por las anclas.
+    Devuelve (alineada1, alineada2, puntuación, None), igual que alignment().
+    """
+    seq1, seq2 = str(seq1), str(seq2)
+    aligned_seq1 = []
+    aligned_seq2 = []
+    _align_region(aligner, seq1, seq2, k, min_k, max_cells, aligned_seq1, aligned_seq2)
+
+    aligned_seq1, aligned_seq2 = ''.join(aligned_seq1), ''.join(aligned_seq2)
+    return aligned_seq1, aligned_seq2, aligner.score_alignment(aligned_seq1, aligned_seq2), None
@@ -0,0 +1,204 @@
+import heapq
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .algoritmos_alineamiento import NeedlemanWunsch, SmithWaterman
+from .utils import read_fasta
+
+# Resultado de alinear la consulta contra un registro:
+# - record: encabezado del registro
+# - score: puntuación óptima
+# - alignment: (alineada consulta, alineada registro), AlineamientoCigar con cigar=True,
+#   o None en modo score_only
+ResultadoBusqueda = namedtuple('ResultadoBusqueda', ['record', 'score', 'alignment'])
+
+
+def get_algorithm(name):
+    """
+    Devuelve la clase de alineamiento por nombre: nw, sw, nw-numpy, sw-numpy, nw-myers
+    """
+    if name == "nw":
+        return NeedlemanWunsch
+    if name == "sw":
+        return SmithWaterman
+    if name in ("nw-numpy", "sw-numpy"):
+        from .vectorizado import NeedlemanWunschNumpy, SmithWatermanNumpy
+        return NeedlemanWunschNumpy if name == "nw-numpy" else SmithWatermanNumpy
+    if name == "nw-myers":
+        from .myers import NeedlemanWunschMyers
+        return NeedlemanWunschMyers
+    raise ValueError(f"Algoritmo desconocido: {name}")
+
+
+def driver_mode(aligner, mode):
+    """
+    Gotoh no tiene modo lineal: con gaps afines, "linear" se resuelve con "pointers"
+    (2 bits por celda), así los valores por defecto de los drivers sirven para ambos
+    """
+    return "pointers" if aligner.affine and mode == "linear" else mode
+
+
+# Estado de cada proceso del pool (se crea una vez en el inicializador)
+_worker = {}
+
+
+def _init_worker(algorithm, params, query, mode, score_only, cigar=False):
+    _worker['aligner'] = get_algorithm(algorithm)(**params)
+    _worker['query'] = query
+    _worker['mode'] = mode
+    _worker['score_only'] = score_only
+    _worker['cigar'] = cigar
+
+
+def _align_record(record):
+    """
+    Alinea la consulta del proceso contra un registro (encabezado, secuencia)
+    """
+    header, sequence = record
+    aligner = _worker['aligner']
+    query = _worker['query']
+
+    if _worker['score_only']:
+        return ResultadoBusqueda(header, aligner.score_only(query, sequence), None)
+
+    if _worker['cigar']:
+        cigar, score, _ = aligner.cigar_alignment(query, sequence)
+        return ResultadoBusqueda(header, score, cigar)
+
+    mode = driver_mode(aligner, _worker['mode'])
+    aligned_query, aligned_subject, score, _ = aligner.alignment(query, sequence, mode=mode)
+    return ResultadoBusqueda(header, score, (aligned_query, aligned_subject))
+
+
+# Alineadores ya construidos en cada proceso del pool: (algoritmo, parámetros) -> instancia
+_aligners = {}
+
+
+def _aligner(algorithm, params):
+    key = (algorithm, json.dumps(params, sort_keys=True))
+    if key not in _aligners:
+        _aligners[key] = get_algorithm(algorithm)(**params)
+    return _aligners[key]
+
+
+def _number(value):
+    # Escalares NumPy -> int/float de Python (JSON)
+    return value.item() if hasattr(value, 'item') else value
+
+
+def align_request(request):
+    """
+    Resuelve una petición y devuelve su respuesta (los errores van en "error"):
+    - algorithm: nw, sw, nw-numpy, sw-numpy, nw-myers (por defecto sw)
+    - params: match, mismatch, gap, substitution_matrix, gap_open, gap_extend
+    - mode: modo de alignment() (por defecto "linear"; con cigar, "pointers")
+    - score_only: solo "score"; cigar: "cigar", "start1" y "start2" en lugar de las cadenas
+    """
+    response = {"id": request.get("id")}
+    try:
+        aligner = _aligner(request.get("algorithm", "sw"), request.get("params", {}))
+        seq1, seq2 = request["seq1"], request["seq2"]
+
+        if request.get("score_only"):
+            response["score"] = _number(aligner.score_only(seq1, seq2))
+        elif request.get("cigar"):
+            cigar, score, _ = aligner.cigar_alignment(seq1, seq2, driver_mode(aligner, request.get("mode", "pointers")))
+            response.update(score=_number(score), cigar=str(cigar), start1=cigar.start1, start2=cigar.start2)
+        else:
+            mode = driver_mode(aligner, request.get("mode", "linear"))
+            aligned1, aligned2, score, _ = aligner.alignment(seq1, seq2, mode=mode)
+            response.update(score=_number(score), aligned1=aligned1, aligned2=aligned2)
+    except Exception as error:
+        # Una petición inválida (parámetros, matriz, secuencias) solo falla ella misma,
+        # no el lote en que viaja
+        response["error"] = f"{type(error).__name__}: {error}"
+    return response
+
+
+def align_batch(batch):
+    """
+    Resuelve un lote de peticiones (servidor y línea de comandos)
+    """
+    return [align_request(request) for request in batch]
+
+
+def _records(subjects):
+    """
+    Acepta la ruta de un FASTA o un iterable de (encabezado, secuencia)
+    """
+    if isinstance(subjects, (str, os.PathLike)):
+        return read_fasta(subjects)
+    return iter(subjects)
+
+
+def pool_map(func, items, jobs, initializer=None, initargs=(), max_pending=None):
+    """
+    Aplica func a cada elemento en un pool de jobs procesos y genera (elemento, resultado)
+    en orden de finalización (búsqueda, todos contra todos y línea de comandos).
+    - como mucho max_pending tareas pendientes (por defecto 4 * jobs): items se consume
+      a medida que avanza, sin cargarlo entero
+    - jobs=1: en este proceso, sin pool (initializer se llama aquí)
+    """
+    if jobs == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for item in items:
+            yield item, func(item)
+        return
+
+    max_pending = max_pending or 4 * jobs
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        pending = {}
+        for item in items:
+            pending[pool.submit(func, item)] = item
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+
+def search(query, subjects, algorithm="sw", jobs=None, top_n=None, mode="linear",
+           score_only=False, cigar=False, **params):
+    """
+    Alinea una consulta contra muchos registros usando todos los núcleos.
+    - subjects: ruta de un FASTA o iterable de (encabezado, secuencia)
+    - algorithm: nw, sw, nw-numpy, sw-numpy, nw-myers
+    - jobs: procesos del pool (por defecto, todos los núcleos)
+    - top_n: si se indica, solo se conservan los N mejores (montículo de tamaño N)
+    - mode: modo de alignment() en cada proceso ("linear" no guarda la matriz)
+    - score_only: solo la puntuación, sin traceback
+    - cigar: el alineamiento como AlineamientoCigar (cigar_alignment en modo "pointers"),
+      mucho más pequeño de devolver desde los procesos que las cadenas con gaps
+    - params: match, mismatch, gap, substitution_matrix...
+    Genera ResultadoBusqueda a medida que terminan; con top_n, los N mejores al final
+    ordenados por puntuación descendente.
+    """
+    get_algorithm(algorithm)(**params).validate_seqs(query, query)
+
+    jobs = jobs or os.cpu_count() or 1
+    worker_args = (algorithm, params, query, mode, score_only, cigar)
+    results = (result for _, result in pool_map(_align_record, _records(subjects), jobs,
+                                                 _init_worker, worker_args))
+
+    if top_n is None:
+        yield from results
+        return
+
+    # Montículo de mínimos: (score, -orden) para preferir el registro más temprano en empates
+    best = []
+    for order, result in enumerate(results):
+        entry = (result.score, -order, result)
+        if len(best) < top_n:
+            heapq.heappush(best, entry)
+        elif entry[:2] > best[0][:2]:
+            heapq.heapreplace(best, entry)
+
+    for _, _, result in sorted(best, key=lambda entry: entry[:2], reverse=True):
+        yield result
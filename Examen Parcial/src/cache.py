@@ -0,0 +1,134 @@
+import hashlib
+import sqlite3
+from collections import OrderedDict
+
+
+def scoring_key(aligner):
+    """
+    Clase y parámetros de puntuación del alineador como texto estable
+    """
+    cls = type(aligner)
+    parts = [f"{cls.__module__}.{cls.__qualname__}", repr(aligner.match), repr(aligner.mismatch), repr(aligner.gap)]
+    if aligner.affine:
+        parts += [repr(aligner.gap_open), repr(aligner.gap_extend)]
+    matrix = aligner.substitution_matrix
+    if matrix is not None:
+        parts += [matrix.name, matrix.alphabet, repr(matrix.table)]
+    return '\x1f'.join(parts)
+
+
+class CacheAlineamientos:
+    """
+    Caché de resultados de alignment() / score_only() direccionada por contenido:
+    - clave: SHA-256 de ambas secuencias, la clase del alineador, sus parámetros
+      y el modo de alignment()
+    - memoria: LRU de hasta max_entries resultados
+    - path: base SQLite opcional, compartida entre procesos (se consulta tras la LRU)
+    - hits / misses: contadores de aciertos y fallos (disk_hits: aciertos en disco)
+    Solo se guardan (alineada1, alineada2, puntuación); la matriz no se conserva.
+    """
+
+    def __init__(self, max_entries=1024, path=None):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser al menos 1")
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, timeout=30)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS results "
+                            "(key TEXT PRIMARY KEY, aligned1 TEXT, aligned2 TEXT, score)")
+            self.db.commit()
+
+    def key(self, aligner, seq1, seq2, kind="alignment"):
+        digest = hashlib.sha256()
+        for part in (kind, scoring_key(aligner), str(seq1), str(seq2)):
+            data = part.encode('utf-8')
+            digest.update(len(data).to_bytes(8, 'little'))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Busca en la LRU y luego en disco; None si no está
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        if self.db is not None:
+            row = self.db.execute("SELECT aligned1, aligned2, score FROM results WHERE key = ?",
+                                  (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, row)
+                return row
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", (key, *value))
+            self.db.commit()
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def alignment(self, aligner, seq1, seq2, mode="matrix"):
+        """
+        aligner.alignment() con caché; devuelve (alineada1, alineada2, puntuación, None).
+        mode forma parte de la clave: "anchors" es heurístico y, con empates, los
+        modos exactos pueden devolver alineamientos distintos de igual puntuación.
+        """
+        key = self.key(aligner, seq1, seq2, kind=f"alignment:{mode}")
+        cached = self.get(key)
+        if cached is None:
+            cached = aligner.alignment(seq1, seq2, mode=mode)[:3]
+            self.put(key, cached)
+        aligned1, aligned2, score = cached
+        return aligned1, aligned2, score, None
+
+    def score_only(self, aligner, seq1, seq2):
+        """
+        aligner.score_only() con caché
+        """
+        key = self.key(aligner, seq1, seq2, kind="score_only")
+        cached = self.get(key)
+        if cached is None:
+            cached = (None, None, aligner.score_only(seq1, seq2))
+            self.put(key, cached)
+        return cached[2]
+
+    def clear(self):
+        """
+        Vacía la LRU y los contadores (la base en disco se conserva)
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.disk_hits = 0
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,127 @@
+import re
+from itertools import groupby
+
+from .utils import EstadisticasAlineamiento
+
+# Operaciones (CIGAR extendido, seq1 como referencia):
+# '=' coincidencia, 'X' sustitución, 'D' residuo de seq1 frente a un gap,
+# 'I' residuo de seq2 frente a un gap
+MATCH, MISMATCH, DELETION, INSERTION = '=', 'X', 'D', 'I'
+
+_CIGAR_RE = re.compile(r'(\d+)([=XDI])')
+
+
+def column_operation(a, b):
+    """
+    Operación de una columna de un alineamiento con gaps
+    """
+    if b == '-':
+        return DELETION
+    if a == '-':
+        return INSERTION
+    return MATCH if a == b else MISMATCH
+
+
+class AlineamientoCigar:
+    """
+    Alineamiento como tramos de operaciones (op, largo) en lugar de dos cadenas con gaps.
+    - start1/end1 y start2/end2: tramo alineado de cada secuencia (seq[start:end]);
+      en global es la secuencia entera, en local el tramo de Smith-Waterman
+    - matches, mismatches, gaps e identity cuestan O(tramos)
+    - to_strings(seq1, seq2) reconstruye las cadenas con gaps cuando hacen falta
+    Se serializa (pickle) como el texto CIGAR: para secuencias largas y parecidas
+    ocupa una fracción de las cadenas.
+    """
+
+    def __init__(self, operations, start1=0, start2=0):
+        self.operations = [(op, length) for op, length in operations if length > 0]
+        self.start1 = start1
+        self.start2 = start2
+        self.end1 = start1 + sum(length for op, length in self.operations if op != INSERTION)
+        self.end2 = start2 + sum(length for op, length in self.operations if op != DELETION)
+
+    @classmethod
+    def from_strings(cls, aligned1, aligned2, start1=0, start2=0):
+        """
+        Convierte dos cadenas alineadas (con '-') en tramos
+        """
+        if len(aligned1) != len(aligned2):
+            raise ValueError("Las secuencias alineadas deben tener la misma longitud")
+        columns = map(column_operation, aligned1, aligned2)
+        return cls([(op, sum(1 for _ in run)) for op, run in groupby(columns)], start1, start2)
+
+    @classmethod
+    def parse(cls, text, start1=0, start2=0):
+        """
+        Lee un texto CIGAR como "12=1X3D40="
+        """
+        text = text.strip()
+        if _CIGAR_RE.sub('', text):
+            raise ValueError(f"CIGAR inválido: {text}")
+        return cls([(op, int(length)) for length, op in _CIGAR_RE.findall(text)], start1, start2)
+
+    def count(self, *ops):
+        return sum(length for op, length in self.operations if op in ops)
+
+    @property
+    def matches(self):
+        return self.count(MATCH)
+
+    @property
+    def mismatches(self):
+        return self.count(MISMATCH)
+
+    @property
+    def gaps(self):
+        return self.count(DELETION, INSERTION)
+
+    @property
+    def identity(self):
+        total = len(self)
+        return (self.matches / total) * 100 if total > 0 else 0
+
+    def stats(self):
+        """
+        Las mismas estadísticas que utils.alignment_stats sobre las cadenas
+        """
+        return EstadisticasAlineamiento(len(self), self.matches, self.mismatches, self.gaps, self.identity)
+
+    def to_strings(self, seq1, seq2):
+        """
+        Cadenas con gaps del alineamiento (seq1 y seq2 completas)
+        """
+        aligned_seq1 = []
+        aligned_seq2 = []
+        i, j = self.start1, self.start2
+        for op, length in self.operations:
+            if op == DELETION:
+                aligned_seq1.append(str(seq1[i:i + length]))
+                aligned_seq2.append('-' * length)
+                i += length
+            elif op == INSERTION:
+                aligned_seq1.append('-' * length)
+                aligned_seq2.append(str(seq2[j:j + length]))
+                j += length
+            else:
+                aligned_seq1.append(str(seq1[i:i + length]))
+                aligned_seq2.append(str(seq2[j:j + length]))
+                i += length
+                j += length
+        return ''.join(aligned_seq1), ''.join(aligned_seq2)
+
+    def __len__(self):
+        return sum(length for _, length in self.operations)
+
+    def __str__(self):
+        return ''.join(f"{length}{op}" for op, length in self.operations)
+
+    def __repr__(self):
+        return f"AlineamientoCigar('{self}', start1={self.start1}, start2={self.start2})"
+
+    def __eq__(self, other):
+        if not isinstance(other, AlineamientoCigar):
+            return NotImplemented
+        return (self.operations, self.start1, self.start2) == (other.operations, other.start1, other.start2)
+
+    def __reduce__(self):
+        return type(self).parse, (str(self), self.start1, self.start2)
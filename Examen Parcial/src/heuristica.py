@@ -0,0 +1,313 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from .busqueda import get_algorithm, search
+from .secuencias import ALPHABETS
+from .utils import read_fasta, FastaIndex
+
+# Archivo de índice: se escribe junto al FASTA con este sufijo
+INDEX_SUFFIX = ".kmi"
+INDEX_MAGIC = b"KMERIDX1"
+# magic, k, largo del alfabeto, largo del nombre del FASTA, registros, k-mers, apariciones, bytes de encabezados
+INDEX_HEADER = struct.Struct('<8sIIIQQQQ')
+
+
+def kmer_codes(seq, k, alphabet):
+    """
+    Genera (posición, código) de cada k-mer de seq en base len(alphabet).
+    Los k-mers con residuos fuera del alfabeto se omiten.
+    """
+    index = {residue: code for code, residue in enumerate(alphabet)}
+    base = len(alphabet)
+    modulo = base ** k
+
+    code = 0
+    valid = 0
+    for pos, residue in enumerate(str(seq).upper()):
+        residue_code = index.get(residue)
+        if residue_code is None:
+            valid = 0
+            code = 0
+            continue
+        code = (code * base + residue_code) % modulo
+        valid += 1
+        if valid >= k:
+            yield pos - k + 1, code
+
+
+def _aligned(offset):
+    return offset + (-offset % 8)
+
+
+class _HeaderTable:
+    """
+    Encabezados guardados como un bloque de bytes y sus desplazamientos (se decodifican al pedirlos)
+    """
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, record):
+        return bytes(self.blob[self.offsets[record]:self.offsets[record + 1]]).decode('utf-8')
+
+
+class IndiceKmer:
+    """
+    Índice de k-mers sobre un conjunto de secuencias, en arreglos planos:
+    - kmers: códigos ordenados
+    - starts: inicio de la lista de apariciones de cada k-mer (len(kmers) + 1)
+    - hit_records / hit_positions: apariciones (registro, posición)
+    - record_offsets: bytes (inicio, fin) de cada registro en el FASTA, si se construyó desde archivo
+    Los arreglos son array o memoryview (índice cargado con mmap desde disco).
+    """
+
+    def __init__(self, k, alphabet, headers, kmers, starts, hit_records, hit_positions,
+                 fasta_path=None, record_offsets=None):
+        self.k = k
+        self.alphabet = alphabet
+        self.headers = headers
+        self.kmers = kmers
+        self.starts = starts
+        self.hit_records = hit_records
+        self.hit_positions = hit_positions
+        self.fasta_path = fasta_path
+        self.record_offsets = record_offsets
+        self.sequences = []
+        self._fasta = None
+
+    @classmethod
+    def build(cls, records, k=11, alphabet="dna", max_occurrences=None):
+        """
+        Construye el índice.
+        - records: ruta de un FASTA o iterable de (encabezado, secuencia)
+        - alphabet: "dna", "protein" o un alfabeto explícito
+        - max_occurrences: k-mers más frecuentes que esto se descartan (repeticiones)
+        """
+        alphabet = ALPHABETS.get(alphabet, alphabet)
+        fasta_path = None
+        record_offsets = None
+        if isinstance(records, (str, os.PathLike)):
+            fasta_path = os.fspath(records)
+            record_offsets = array('Q')
+            records = read_fasta(fasta_path, with_offsets=True)
+
+        headers = []
+        sequences = []
+        occurrences = {}
+        for record, (header, seq, *offsets) in enumerate(records):
+            headers.append(header)
+            sequences.append(seq)
+            if record_offsets is not None:
+                record_offsets.extend(offsets)
+            for pos, code in kmer_codes(seq, k, alphabet):
+                occurrences.setdefault(code, []).append((record, pos))
+
+        kmers = array('Q')
+        starts = array('Q', [0])
+        hit_records = array('I')
+        hit_positions = array('I')
+        for code in sorted(occurrences):
+            hits = occurrences[code]
+            if max_occurrences is not None and len(hits) > max_occurrences:
+                continue
+            kmers.append(code)
+            for record, pos in hits:
+                hit_records.append(record)
+                hit_positions.append(pos)
+            starts.append(len(hit_records))
+
+        index = cls(k, alphabet, headers, kmers, starts, hit_records, hit_positions,
+                    fasta_path, record_offsets)
+        index.sequences = sequences
+        return index
+
+    def save(self, path=None):
+        """
+        Escribe el índice en un archivo binario (por defecto, junto al FASTA con sufijo .kmi).
+        Todo son arreglos planos alineados a 8 bytes, listos para cargar con mmap.
+        """
+        if self.fasta_path is None:
+            raise ValueError("Solo se puede guardar un índice construido desde un archivo FASTA")
+        path = path or self.fasta_path + INDEX_SUFFIX
+
+        alphabet = self.alphabet.encode('ascii')
+        fasta_name = os.path.relpath(self.fasta_path, os.path.dirname(os.path.abspath(path))).encode('utf-8')
+        encoded_headers = [self.headers[r].encode('utf-8') for r in range(len(self.headers))]
+        header_offsets = array('Q', [0])
+        for encoded in encoded_headers:
+            header_offsets.append(header_offsets[-1] + len(encoded))
+        blob = b''.join(encoded_headers)
+
+        sections = [alphabet + fasta_name, array('Q', self.kmers), array('Q', self.starts),
+                    array('Q', self.record_offsets), header_offsets,
+                    array('I', self.hit_records), array('I', self.hit_positions), blob]
+        if sys.byteorder != 'little':
+            for section in sections:
+                if isinstance(section, array):
+                    section.byteswap()
+
+        with open(path, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, self.k, len(alphabet), len(fasta_name), len(self.headers),
+                                      len(self.kmers), len(self.hit_records), len(blob)))
+            for section in sections:
+                f.write(bytes(section))
+                f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carga un índice guardado con save() mediante mmap, sin parsear los arreglos
+        (memoryview sobre el archivo). Las secuencias se leen del FASTA al pedirlas.
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No se encontró el índice: {path}")
+
+        magic, k, alphabet_len, name_len, n_records, n_kmers, n_hits, blob_len = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"El archivo {path} no es un índice de k-mers")
+        if sys.byteorder != 'little':
+            raise ValueError("Los índices en disco solo se pueden cargar en máquinas little-endian")
+
+        view = memoryview(data)
+        offset = INDEX_HEADER.size
+        alphabet = bytes(view[offset:offset + alphabet_len]).decode('ascii')
+        fasta_name = bytes(view[offset + alphabet_len:offset + alphabet_len + name_len]).decode('utf-8')
+        offset = _aligned(offset + alphabet_len + name_len)
+
+        arrays = []
+        for typecode, count in (('Q', n_kmers), ('Q', n_kmers + 1), ('Q', 2 * n_records),
+                                ('Q', n_records + 1), ('I', n_hits), ('I', n_hits)):
+            size = count * array(typecode).itemsize
+            arrays.append(view[offset:offset + size].cast(typecode))
+            offset = _aligned(offset + size)
+        kmers, starts, record_offsets, header_offsets, hit_records, hit_positions = arrays
+        headers = _HeaderTable(header_offsets, view[offset:offset + blob_len])
+
+        fasta_path = os.path.join(os.path.dirname(os.path.abspath(path)), fasta_name)
+        return cls(k, alphabet, headers, kmers, starts, hit_records, hit_positions,
+                   fasta_path, record_offsets)
+
+    @classmethod
+    def open(cls, fasta_path):
+        """
+        Carga el índice guardado junto a fasta_path
+        """
+        return cls.load(os.fspath(fasta_path) + INDEX_SUFFIX)
+
+    def __len__(self):
+        return len(self.headers)
+
+    def lookup(self, code):
+        """
+        Apariciones (registro, posición) de un k-mer (búsqueda binaria)
+        """
+        slot = bisect_left(self.kmers, code)
+        if slot == len(self.kmers) or self.kmers[slot] != code:
+            return []
+        start, end = self.starts[slot], self.starts[slot + 1]
+        return list(zip(self.hit_records[start:end], self.hit_positions[start:end]))
+
+    def record(self, record):
+        """
+        (encabezado, secuencia) de un registro
+        - índice construido en memoria: secuencia guardada
+        - índice cargado de disco: se lee del FASTA por sus desplazamientos
+        """
+        if self.sequences:
+            return self.headers[record], self.sequences[record]
+
+        if self._fasta is None:
+            self._fasta = FastaIndex(self.fasta_path)
+        start, end = self.record_offsets[2 * record], self.record_offsets[2 * record + 1]
+        return self._fasta.read_at(start, end)
+
+
+def xdrop_extend(aligner, query, subject, q_start, s_start, length, x_drop):
+    """
+    Extiende una semilla sin gaps en ambos sentidos con corte X-drop.
+    Devuelve (puntuación máxima del segmento extendido, posición de la consulta
+    donde termina ese segmento por la derecha).
+    """
+    score = sum(aligner.calculate_score(query[q_start + d], subject[s_start + d]) for d in range(length))
+
+    best_total = score
+    q_end = q_start + length
+    for step, (q, s) in ((1, (q_start + length, s_start + length)), (-1, (q_start - 1, s_start - 1))):
+        running = 0
+        best = 0
+        while 0 <= q < len(query) and 0 <= s < len(subject):
+            running += aligner.calculate_score(query[q], subject[s])
+            if running > best:
+                best = running
+                if step == 1:
+                    q_end = q + 1
+            elif running < best - x_drop:
+                break
+            q += step
+            s += step
+        best_total += best
+    return best_total, q_end
+
+
+def seed_scores(query, index, aligner, x_drop=10, records=None):
+    """
+    Mejor puntuación de semilla extendida por registro del índice.
+    Cada registro con semillas se lee una sola vez (en un índice cargado de disco,
+    leerlo es parsearlo del FASTA); records, si se pasa, queda con
+    registro -> (encabezado, secuencia) para reutilizarlos.
+    """
+    if records is None:
+        records = {}
+    best = {}
+    # Por (registro, diagonal): hasta dónde de la consulta ya se extendió
+    covered = {}
+
+    for q_pos, code in kmer_codes(query, index.k, index.alphabet):
+        for record, s_pos in index.lookup(code):
+            diagonal = (record, s_pos - q_pos)
+            if covered.get(diagonal, -1) >= q_pos:
+                continue
+
+            if record not in records:
+                records[record] = index.record(record)
+            subject = records[record][1]
+            score, q_end = xdrop_extend(aligner, query, subject, q_pos, s_pos, index.k, x_drop)
+            # Las semillas de esta diagonal dentro del segmento extendido darían el mismo
+            covered[diagonal] = q_end - index.k
+            if score > best.get(record, float('-inf')):
+                best[record] = score
+    return best
+
+
+def seeded_search(query, index, algorithm="sw", min_seed_score=20, x_drop=10, jobs=None,
+                  top_n=None, mode="linear", **params):
+    """
+    Búsqueda heurística tipo BLAST:
+    1. k-mers de la consulta contra el índice
+    2. extensión sin gaps con X-drop
+    3. alignment() exacto (busqueda.search) solo en los registros cuya mejor semilla
+       alcanza min_seed_score
+    Genera ResultadoBusqueda como busqueda.search.
+    """
+    aligner = get_algorithm(algorithm)(**params)
+    aligner.validate_seqs(query, query)
+
+    records = {}
+    scores = seed_scores(query, index, aligner, x_drop, records)
+    candidates = [records[record] for record in sorted(scores) if scores[record] >= min_seed_score]
+    if not candidates:
+        return iter(())
+
+    return search(query, candidates, algorithm=algorithm, jobs=jobs, top_n=top_n, mode=mode, **params)
@@ -0,0 +1,202 @@
+import os
+
+from .secuencias import SecuenciaCodificada
+
+# Matrices estándar en formato NCBI (fuente: ftp.ncbi.nih.gov/blast/matrices)
+BLOSUM62_TEXT = """
+   A  R  N  D  C  Q  E  G  H  I  L  K  M  F  P  S  T  W  Y  V  B  Z  X  *
+A  4 -1 -2 -2  0 -1 -1  0 -2 -1 -1 -1 -1 -2 -1  1  0 -3 -2  0 -2 -1  0 -4
+R -1  5  0 -2 -3  1  0 -2  0 -3 -2  2 -1 -3 -2 -1 -1 -3 -2 -3 -1  0 -1 -4
+N -2  0  6  1 -3  0  0  0  1 -3 -3  0 -2 -3 -2  1  0 -4 -2 -3  3  0 -1 -4
+D -2 -2  1  6 -3  0  2 -1 -1 -3 -4 -1 -3 -3 -1  0 -1 -4 -3 -3  4  1 -1 -4
+C  0 -3 -3 -3  9 -3 -4 -3 -3 -1 -1 -3 -1 -2 -3 -1 -1 -2 -2 -1 -3 -3 -2 -4
+Q -1  1  0  0 -3  5  2 -2  0 -3 -2  1  0 -3 -1  0 -1 -2 -1 -2  0  3 -1 -4
+E -1  0  0  2 -4  2  5 -2  0 -3 -3  1 -2 -3 -1  0 -1 -3 -2 -2  1  4 -1 -4
+G  0 -2  0 -1 -3 -2 -2  6 -2 -4 -4 -2 -3 -3 -2  0 -2 -2 -3 -3 -1 -2 -1 -4
+H -2  0  1 -1 -3  0  0 -2  8 -3 -3 -1 -2 -1 -2 -1 -2 -2  2 -3  0  0 -1 -4
+I -1 -3 -3 -3 -1 -3 -3 -4 -3  4  2 -3  1  0 -3 -2 -1 -3 -1  3 -3 -3 -1 -4
+L -1 -2 -3 -4 -1 -2 -3 -4 -3  2  4 -2  2  0 -3 -2 -1 -2 -1  1 -4 -3 -1 -4
+K -1  2  0 -1 -3  1  1 -2 -1 -3 -2  5 -1 -3 -1  0 -1 -3 -2 -2  0  1 -1 -4
+M -1 -1 -2 -3 -1  0 -2 -3 -2  1  2 -1  5  0 -2 -1 -1 -1 -1  1 -3 -1 -1 -4
+F -2 -3 -3 -3 -2 -3 -3 -3 -1  0  0 -3  0  6 -4 -2 -2  1  3 -1 -3 -3 -1 -4
+P -1 -2 -2 -1 -3 -1 -1 -2 -2 -3 -3 -1 -2 -4  7 -1 -1 -4 -3 -2 -2 -1 -2 -4
+S  1 -1  1  0 -1  0  0  0 -1 -2 -2  0 -1 -2 -1  4  1 -3 -2 -2  0  0  0 -4
+T  0 -1  0 -1 -1 -1 -1 -2 -2 -1 -1 -1 -1 -2 -1  1  5 -2 -2  0 -1 -1  0 -4
+W -3 -3 -4 -4 -2 -2 -3 -2 -2 -3 -2 -3 -1  1 -4 -3 -2 11  2 -3 -4 -3 -2 -4
+Y -2 -2 -2 -3 -2 -1 -2 -3  2 -1 -1 -2 -1  3 -3 -2 -2  2  7 -1 -3 -2 -1 -4
+V  0 -3 -3 -3 -1 -2 -2 -3 -3  3  1 -2  1 -1 -2 -2  0 -3 -1  4 -3 -2 -1 -4
+B -2 -1  3  4 -3  0  1 -1  0 -3 -4  0 -3 -3 -2  0 -1 -4 -3 -3  4  1 -1 -4
+Z -1  0  0  1 -3  3  4 -2  0 -3 -3  1 -1 -3 -1  0 -1 -3 -2 -2  1  4 -1 -4
+X  0 -1 -1 -1 -2 -1 -1 -1 -1 -1 -1 -1 -1 -1 -2  0  0 -2 -1 -1 -1 -1 -1 -4
+* -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4 -4  1
+"""
+
+PAM250_TEXT = """
+   A  R  N  D  C  Q  E  G  H  I  L  K  M  F  P  S  T  W  Y  V  B  Z  X  *
+A  2 -2  0  0 -2  0  0  1 -1 -1 -2 -1 -1 -3  1  1  1 -6 -3  0  0  0  0 -8
+R -2  6  0 -1 -4  1 -1 -3  2 -2 -3  3  0 -4  0  0 -1  2 -4 -2 -1  0 -1 -8
+N  0  0  2  2 -4  1  1  0  2 -2 -3  1 -2 -3  0  1  0 -4 -2 -2  2  1  0 -8
+D  0 -1  2  4 -5  2  3  1  1 -2 -4  0 -3 -6 -1  0  0 -7 -4 -2  3  3 -1 -8
+C -2 -4 -4 -5 12 -5 -5 -3 -3 -2 -6 -5 -5 -4 -3  0 -2 -8  0 -2 -4 -5 -3 -8
+Q  0  1  1  2 -5  4  2 -1  3 -2 -2  1 -1 -5  0 -1 -1 -5 -4 -2  1  3 -1 -8
+E  0 -1  1  3 -5  2  4  0  1 -2 -3  0 -2 -5 -1  0  0 -7 -4 -2  3  3 -1 -8
+G  1 -3  0  1 -3 -1  0  5 -2 -3 -4 -2 -3 -5  0  1  0 -7 -5 -1  0  0 -1 -8
+H -1  2  2  1 -3  3  1 -2  6 -2 -2  0 -2 -2  0 -1 -1 -3  0 -2  1  2 -1 -8
+I -1 -2 -2 -2 -2 -2 -2 -3 -2  5  2 -2  2  1 -2 -1  0 -5 -1  4 -2 -2 -1 -8
+L -2 -3 -3 -4 -6 -2 -3 -4 -2  2  6 -3  4  2 -3 -3 -2 -2 -1  2 -3 -3 -1 -8
+K -1  3  1  0 -5  1  0 -2  0 -2 -3  5  0 -5 -1  0  0 -3 -4 -2  1  0 -1 -8
+M -1  0 -2 -3 -5 -1 -2 -3 -2  2  4  0  6  0 -2 -2 -1 -4 -2  2 -2 -2 -1 -8
+F -3 -4 -3 -6 -4 -5 -5 -5 -2  1  2 -5  0  9 -5 -3 -3  0  7 -1 -4 -5 -2 -8
+P  1  0  0 -1 -3  0 -1  0  0 -2 -3 -1 -2 -5  6  1  0 -6 -5 -1 -1  0 -1 -8
+S  1  0  1  0  0 -1  0  1 -1 -1 -3  0 -2 -3  1  2  1 -2 -3 -1  0  0  0 -8
+T  1 -1  0  0 -2 -1  0  0 -1  0 -2  0 -1 -3  0  1  3 -5 -3  0  0 -1  0 -8
+W -6  2 -4 -7 -8 -5 -7 -7 -3 -5 -2 -3 -4  0 -6 -2 -5 17  0 -6 -5 -6 -4 -8
+Y -3 -4 -2 -4  0 -4 -4 -5  0 -1 -1 -4 -2  7 -5 -3 -3  0 10 -2 -3 -4 -2 -8
+V  0 -2 -2 -2 -2 -2 -2 -1 -2  4  2 -2  2 -1 -1 -1  0 -6 -2  4 -2 -2 -1 -8
+B  0 -1  2  3 -4  1  3  0  1 -2 -3  1 -2 -4 -1  0  0 -5 -3 -2  3  2 -1 -8
+Z  0  0  1  3 -5  3  3  0  2 -2 -3  0 -2 -5  0  0 -1 -6 -4 -2  2  3 -1 -8
+X  0 -1  0 -1 -3 -1 -1 -1 -1 -1 -1 -1 -1 -2 -1  0  0 -4 -2 -1 -1 -1 -1 -8
+* -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8 -8  1
+"""
+
+
+# Código para residuos fuera del alfabeto de la matriz
+INVALID = 255
+
+
+class MatrizSustitucion:
+    """
+    Matriz de sustitución densa.
+    - alphabet: residuos en el orden de las filas/columnas
+    - table: tabla entera table[código1][código2]
+    - codes: tabla de traducción de 256 bytes (carácter -> código), también en minúsculas
+    """
+
+    def __init__(self, alphabet, table, name=""):
+        if len(table) != len(alphabet) or any(len(row) != len(alphabet) for row in table):
+            raise ValueError("La tabla de sustitución debe ser cuadrada y del tamaño del alfabeto")
+
+        self.name = name
+        self.alphabet = alphabet
+        self.table = [list(row) for row in table]
+
+        codes = bytearray([INVALID] * 256)
+        for code, residue in enumerate(alphabet):
+            codes[ord(residue.upper())] = code
+            codes[ord(residue.lower())] = code
+        self.codes = bytes(codes)
+
+    def encode(self, seq):
+        """
+        Convierte una secuencia (str o SecuenciaCodificada) en bytes de códigos
+        """
+        try:
+            if isinstance(seq, SecuenciaCodificada):
+                encoded = seq.recode(self.codes)
+            else:
+                encoded = seq.encode('ascii').translate(self.codes)
+        except UnicodeEncodeError:
+            raise ValueError(f"La secuencia contiene caracteres no válidos para la matriz {self.name}")
+
+        if INVALID in encoded:
+            residue = seq[encoded.index(INVALID)]
+            raise ValueError(f"Residuo '{residue}' no válido para la matriz {self.name}")
+        return encoded
+
+    def score(self, a, b):
+        """
+        Puntuación de sustitución entre dos residuos
+        """
+        code_a = self.codes[ord(a)] if ord(a) < 256 else INVALID
+        code_b = self.codes[ord(b)] if ord(b) < 256 else INVALID
+        if code_a == INVALID or code_b == INVALID:
+            raise ValueError(f"Residuo no válido para la matriz {self.name}: '{a}' / '{b}'")
+        return self.table[code_a][code_b]
+
+    def __repr__(self):
+        return f"MatrizSustitucion({self.name!r}, alphabet={self.alphabet!r})"
+
+
+def parse_substitution_matrix(text, name=""):
+    """
+    Lee una matriz en formato NCBI:
+    - líneas con '#' son comentarios
+    - primera línea: alfabeto de columnas
+    - resto: residuo seguido de sus puntuaciones
+    """
+    lines = [line.split() for line in text.splitlines()
+             if line.strip() and not line.lstrip().startswith('#')]
+    if not lines:
+        raise ValueError(f"La matriz {name} está vacía")
+
+    alphabet = ''.join(lines[0])
+    table = []
+    for code, fields in enumerate(lines[1:]):
+        if fields[0] != alphabet[code]:
+            raise ValueError(f"Fila {fields[0]} fuera de orden en la matriz {name}")
+        table.append([int(value) for value in fields[1:]])
+    return MatrizSustitucion(alphabet, table, name)
+
+
+def load_substitution_matrix(filepath):
+    """
+    Carga una matriz de sustitución desde un archivo en formato NCBI
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No se encontró el archivo: {filepath}")
+
+    return parse_substitution_matrix(text, os.path.basename(filepath))
+
+
+def blosum62():
+    return parse_substitution_matrix(BLOSUM62_TEXT, "BLOSUM62")
+
+
+def pam250():
+    return parse_substitution_matrix(PAM250_TEXT, "PAM250")
+
+
+def dna_matrix(match=1, transition=-1, transversion=-2):
+    """
+    Matriz de ADN que distingue transiciones (A<->G, C<->T) de transversiones
+    """
+    purines = set('AG')
+    alphabet = 'ACGT'
+    table = []
+    for a in alphabet:
+        row = []
+        for b in alphabet:
+            if a == b:
+                row.append(match)
+            elif (a in purines) == (b in purines):
+                row.append(transition)
+            else:
+                row.append(transversion)
+        table.append(row)
+    return MatrizSustitucion(alphabet, table, "DNA")
+
+
+BUILTIN_MATRICES = {
+    "BLOSUM62": blosum62,
+    "PAM250": pam250,
+    "DNA": dna_matrix,
+}
+
+
+def get_substitution_matrix(matrix):
+    """
+    Devuelve una MatrizSustitucion a partir de:
+    - una instancia (se devuelve tal cual)
+    - un nombre incorporado: BLOSUM62, PAM250, DNA
+    - la ruta de un archivo en formato NCBI
+    """
+    if isinstance(matrix, MatrizSustitucion):
+        return matrix
+    if matrix.upper() in BUILTIN_MATRICES:
+        return BUILTIN_MATRICES[matrix.upper()]()
+    if os.path.exists(matrix):
+        return load_substitution_matrix(matrix)
+    raise ValueError(f"Matriz de sustitución desconocida: {matrix}")
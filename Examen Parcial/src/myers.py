@@ -0,0 +1,150 @@
+from .algoritmos_alineamiento import NeedlemanWunsch
+
+
+def _pattern_masks(pattern):
+    """
+    Máscara de bits por residuo: bit i encendido si pattern[i] es ese residuo
+    """
+    masks = {}
+    for i, residue in enumerate(pattern):
+        masks[residue] = masks.get(residue, 0) | (1 << i)
+    return masks
+
+
+def bit_parallel_columns(pattern, text, global_mode=True):
+    """
+    Algoritmo de Myers: recorre text columna a columna con vectores de bits
+    (enteros de Python) de las diferencias verticales +1 / -1 de la columna.
+    Genera D[len(pattern)][j] para j = 1..len(text).
+    - global_mode=True: fila 0 igual a j (distancia de edición global)
+    - global_mode=False: fila 0 en cero (el patrón puede empezar en cualquier lugar del texto)
+    """
+    m = len(pattern)
+    masks = _pattern_masks(pattern)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+
+    # Columna 0: D[i][0] = i, todas las diferencias verticales son +1
+    vp = full
+    vn = 0
+    distance = m
+    for residue in text:
+        eq = masks.get(residue, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | (~(xh | vp) & full)
+        hn = vp & xh
+
+        if hp & high:
+            distance += 1
+        elif hn & high:
+            distance -= 1
+
+        hp = (hp << 1) & full
+        hn = (hn << 1) & full
+        if global_mode:
+            hp |= 1
+        vp = hn | (~(xv | hp) & full)
+        vn = hp & xv
+        yield distance
+
+
+def edit_distance(seq1, seq2):
+    """
+    Distancia de edición (Levenshtein) entre dos secuencias en O(n * m / w)
+    """
+    seq1, seq2 = str(seq1), str(seq2)
+    if not seq1 or not seq2:
+        return len(seq1) + len(seq2)
+
+    distance = len(seq1)
+    for distance in bit_parallel_columns(seq1, seq2):
+        pass
+    return distance
+
+
+def best_hit(pattern, text):
+    """
+    Búsqueda semiglobal: mejor aparición aproximada de pattern dentro de text.
+    Devuelve (distancia, inicio, fin) con text[inicio:fin] el tramo alineado;
+    en empates, el primer fin y el tramo más corto.
+    """
+    pattern, text = str(pattern), str(text)
+
+    best, end = len(pattern), 0
+    for j, distance in enumerate(bit_parallel_columns(pattern, text, global_mode=False), start=1):
+        if distance < best:
+            best, end = distance, j
+
+    # Inicio: mismo recorrido hacia atrás desde el fin (patrón y texto invertidos)
+    start = end
+    columns = bit_parallel_columns(pattern[::-1], text[:end][::-1], global_mode=False)
+    for j, distance in enumerate(columns, start=1):
+        if distance == best:
+            start = end - j
+            break
+    return best, start, end
+
+
+# ===============================================================================
+class NeedlemanWunschMyers(NeedlemanWunsch):
+    """
+    Needleman-Wunsch para puntuaciones que son una transformación lineal de la
+    distancia de edición (algoritmo bit-paralelo de Myers).
+    - requiere mismatch - match == gap - match / 2 < 0: entonces
+      score = match * (n + m) / 2 - (match - mismatch) * distancia
+    - score_only, edit_distance y best_hit procesan una columna entera por paso
+    - mode="banded" usa la distancia para fijar la banda exacta del traceback
+    """
+
+    def __init__(self, match=0, mismatch=-1, gap=-1, substitution_matrix=None, metrics=None):
+        if substitution_matrix is not None:
+            raise ValueError("Myers no admite matrices de sustitución")
+        if not mismatch - match == gap - match / 2 < 0:
+            raise ValueError("Myers requiere mismatch - match == gap - match / 2 < 0 "
+                             "(puntuación equivalente a distancia de edición)")
+        super().__init__(match, mismatch, gap, metrics=metrics)
+
+
+    def distance_to_score(self, seq1, seq2, distance):
+        score = self.match * (len(seq1) + len(seq2)) / 2 - (self.match - self.mismatch) * distance
+        return int(score) if score == int(score) else score
+
+
+    def edit_distance(self, seq1, seq2):
+        self.validate_seqs(seq1, seq2)
+        return edit_distance(seq1, seq2)
+
+
+    def score_only(self, seq1, seq2):
+        """
+        Puntuación óptima a partir de la distancia de edición
+        - el patrón (vectores de bits) es la secuencia más corta
+        """
+        self.validate_seqs(seq1, seq2)
+
+        if len(seq1) > len(seq2):
+            seq1, seq2 = seq2, seq1
+        return self.distance_to_score(seq1, seq2, edit_distance(seq1, seq2))
+
+
+    def best_hit(self, pattern, text):
+        """
+        Mejor aparición de pattern en text (semiglobal): (distancia, inicio, fin)
+        """
+        self.validate_seqs(pattern, text)
+        return best_hit(pattern, text)
+
+
+    def banded(self, seq1, seq2, band=None):
+        """
+        Un camino con distancia D tiene a lo sumo D gaps, así que no se aleja más
+        de las diagonales (d - D) / 2 .. (d + D) / 2 (d = m - n): una sola banda
+        basta y el traceback coincide con el de la matriz completa.
+        """
+        distance = self.run_phase("edit_distance", edit_distance, seq1, seq2)
+        d = len(seq2) - len(seq1)
+        matrix = self.run_phase("fill_band", self.fill_band, seq1, seq2, (d - distance) // 2, (d + distance) // 2)
+
+        aligned_seq1, aligned_seq2 = self.run_phase("traceback", self.band_traceback, seq1, seq2, matrix)
+        return aligned_seq1, aligned_seq2, matrix.get(len(seq1), len(seq2)), matrix
@@ -0,0 +1,258 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .algoritmos_alineamiento import SmithWaterman
+
+# Estado de cada proceso del pool (se crea una vez en el inicializador)
+_worker = {}
+
+
+def live_edges(buf, n_rows, n_cols, tile):
+    """
+    Bordes vivos del frente de onda sobre un búfer compartido: memoria O(n + m).
+    - tops[c]: última fila del último bloque terminado de la columna de bloques c
+    - lefts[r]: última columna del último bloque terminado de la fila de bloques r
+    Cada bloque (r, c) lee tops[c] y lefts[r] (esquina incluida en ambos) y los
+    reemplaza por los suyos; el siguiente en leerlos depende de él, así que no hay carreras.
+    """
+    tops = np.ndarray((n_cols, tile + 1), dtype=np.int64, buffer=buf)
+    lefts = np.ndarray((n_rows, tile + 1), dtype=np.int64, buffer=buf, offset=tops.nbytes)
+    return tops, lefts
+
+
+def spilled_edges(directory, n, m, tile, mode='r+'):
+    """
+    Bordes para el traceback en archivos mapeados (np.memmap), fuera de la RAM:
+    una fila cada tile filas (rows) y una columna cada tile columnas (cols)
+    """
+    rows = np.memmap(os.path.join(directory, "rows.bin"), dtype=np.int64, mode=mode,
+                     shape=(-(-n // tile) + 1, m + 1))
+    cols = np.memmap(os.path.join(directory, "cols.bin"), dtype=np.int64, mode=mode,
+                     shape=(-(-m // tile) + 1, n + 1))
+    return rows, cols
+
+
+def _init_worker(aligner, seq1, seq2, tile, local, live_name, directory):
+    n, m = len(seq1), len(seq2)
+    _worker['shm'] = shared_memory.SharedMemory(name=live_name)
+    _worker['live'] = live_edges(_worker['shm'].buf, -(-n // tile), -(-m // tile), tile)
+    _worker['spill'] = spilled_edges(directory, n, m, tile)
+    _worker['aligner'] = aligner
+    _worker['seqs'] = (seq1, seq2)
+    _worker['tile'] = tile
+    _worker['local'] = local
+
+
+def _close_worker():
+    _worker.pop('live')
+    _worker.pop('spill')
+    _worker.pop('shm').close()
+
+
+def tile_bounds(r, c, n, m, tile):
+    """
+    Filas (i0, i1] y columnas (j0, j1] que calcula el bloque (r, c)
+    """
+    return r * tile, min((r + 1) * tile, n), c * tile, min((c + 1) * tile, m)
+
+
+def tile_matrix(aligner, seq1, seq2, top, left):
+    """
+    Matriz de un bloque a partir de sus bordes (fila superior y columna izquierda,
+    esquina incluida en ambos), con el fill_rows del propio alineador: los motores
+    NumPy llenan cada bloque con filas vectorizadas.
+    """
+    return [top] + list(aligner.fill_rows(seq1, seq2, top, left))
+
+
+def _fill_tile(r, c):
+    """
+    Calcula un bloque a partir de los bordes vivos, los reemplaza por su última fila
+    y su última columna, y guarda ambas en los archivos del traceback.
+    Devuelve (r, c, máximo, posición) del bloque (primer máximo en orden de filas).
+    """
+    seq1, seq2 = _worker['seqs']
+    tops, lefts = _worker['live']
+    rows, cols = _worker['spill']
+    i0, i1, j0, j1 = tile_bounds(r, c, len(seq1), len(seq2), _worker['tile'])
+    height, width = i1 - i0 + 1, j1 - j0 + 1
+
+    matrix = tile_matrix(_worker['aligner'], seq1[i0:i1], seq2[j0:j1],
+                         tops[c, :width].tolist(), lefts[r, :height].tolist())
+    tops[c, :width] = matrix[-1]
+    lefts[r, :height] = [row[-1] for row in matrix]
+    rows[r + 1, j0:j1 + 1] = tops[c, :width]
+    cols[c + 1, i0:i1 + 1] = lefts[r, :height]
+
+    max_value = 0
+    max_pos = (0, 0)
+    if _worker['local']:
+        for i in range(1, len(matrix)):
+            # argmax: primera posición del máximo, con filas de lista o de NumPy
+            j = int(np.argmax(matrix[i]))
+            if matrix[i][j] > max_value:
+                max_value = int(matrix[i][j])
+                max_pos = (i0 + i, j0 + j)
+    return r, c, max_value, max_pos
+
+
+def _wavefront(n_rows, n_cols, jobs, worker_args):
+    """
+    Ejecuta los bloques por frente de onda: (r, c) se lanza cuando terminaron
+    (r - 1, c) y (r, c - 1), así que cada antidiagonal corre en paralelo.
+    Devuelve los resultados de _fill_tile.
+    """
+    if jobs == 1:
+        _init_worker(*worker_args)
+        try:
+            return [_fill_tile(r, c) for r in range(n_rows) for c in range(n_cols)]
+        finally:
+            _close_worker()
+
+    results = []
+    waiting = {(r, c): (r > 0) + (c > 0) for r in range(n_rows) for c in range(n_cols)}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=worker_args) as pool:
+        pending = {pool.submit(_fill_tile, 0, 0)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results.append(result)
+                r, c = result[:2]
+                for following in ((r + 1, c), (r, c + 1)):
+                    if following in waiting:
+                        waiting[following] -= 1
+                        if waiting[following] == 0:
+                            pending.add(pool.submit(_fill_tile, *following))
+    return results
+
+
+def _tiled_traceback(aligner, seq1, seq2, rows, cols, tile, start, local):
+    """
+    Mismo recorrido que traceback, recalculando solo los bloques por los que pasa
+    el camino (a partir de los bordes guardados). Memoria O(tile^2).
+    """
+    n, m = len(seq1), len(seq2)
+    aligned_seq1 = []
+    aligned_seq2 = []
+    i, j = start
+    current = None
+    matrix = None
+
+    while i > 0 or j > 0:
+        if i == 0 or j == 0:
+            if local:
+                break
+            # Primera fila o columna: solo gaps
+            if j == 0:
+                aligned_seq1.append(seq1[i-1])
+                aligned_seq2.append('-')
+                i -= 1
+            else:
+                aligned_seq1.append('-')
+                aligned_seq2.append(seq2[j-1])
+                j -= 1
+            continue
+
+        # Bloque que contiene (i, j) en su interior; sus bordes incluyen a los vecinos
+        r, c = (i - 1) // tile, (j - 1) // tile
+        i0, i1, j0, j1 = tile_bounds(r, c, n, m, tile)
+        if current != (r, c):
+            current = (r, c)
+            matrix = tile_matrix(aligner, seq1[i0:i1], seq2[j0:j1],
+                                 rows[r, j0:j1 + 1].tolist(), cols[c, i0:i1 + 1].tolist())
+
+        li, lj = i - i0, j - j0
+        score_current = matrix[li][lj]
+        if local and score_current <= 0:
+            break
+        if score_current == matrix[li-1][lj-1] + aligner.calculate_score(seq1[i-1], seq2[j-1]):
+            aligned_seq1.append(seq1[i-1])
+            aligned_seq2.append(seq2[j-1])
+            i -= 1
+            j -= 1
+        elif score_current == matrix[li-1][lj] + aligner.gap:
+            aligned_seq1.append(seq1[i-1])
+            aligned_seq2.append('-')
+            i -= 1
+        else:
+            aligned_seq1.append('-')
+            aligned_seq2.append(seq2[j-1])
+            j -= 1
+
+    return ''.join(reversed(aligned_seq1)), ''.join(reversed(aligned_seq2))
+
+
+def parallel_traceback(aligner, seq1, seq2, jobs=None, tile=512, spill_dir=None):
+    """
+    Alineamiento de un solo par repartido en varios núcleos (NW o SW con gap lineal).
+    - la matriz se divide en bloques de tile x tile que se llenan por frente de onda
+      en un pool de procesos
+    - en memoria compartida solo viven los bordes del frente de onda (live_edges):
+      memoria O(n + m)
+    - los bordes que necesita el traceback (una fila cada tile filas y una columna
+      cada tile columnas, O((n + m) * max(n, m) / tile)) se escriben en archivos
+      mapeados en spill_dir (por defecto, el directorio temporal); si no caben, ValueError
+      antes de empezar
+    - el traceback recalcula solo los bloques que atraviesa el camino
+    Devuelve (alineada1, alineada2, puntuación, celda final del alineamiento).
+    """
+    local = isinstance(aligner, SmithWaterman)
+    jobs = jobs or os.cpu_count() or 1
+    n, m = len(seq1), len(seq2)
+    tile = min(tile, max(n, m))
+    n_rows, n_cols = -(-n // tile), -(-m // tile)
+
+    spill_dir = spill_dir or tempfile.gettempdir()
+    needed = ((n_rows + 1) * (m + 1) + (n_cols + 1) * (n + 1)) * 8
+    free = shutil.disk_usage(spill_dir).free
+    if needed > free:
+        raise ValueError(f"El modo paralelo necesita {needed / 1e9:.1f} GB en {spill_dir} para los bordes "
+                         f"del traceback y hay {free / 1e9:.1f} GB libres (usa un tile mayor u otro spill_dir)")
+
+    directory = tempfile.mkdtemp(prefix="paralelo_", dir=spill_dir)
+    live_shm = shared_memory.SharedMemory(create=True, size=(n_rows + n_cols) * (tile + 1) * 8)
+    try:
+        gap = 0 if local else aligner.gap
+        tops, lefts = live_edges(live_shm.buf, n_rows, n_cols, tile)
+        for c in range(n_cols):
+            _, _, j0, j1 = tile_bounds(0, c, n, m, tile)
+            tops[c, :j1 - j0 + 1] = gap * np.arange(j0, j1 + 1)
+        for r in range(n_rows):
+            i0, i1, _, _ = tile_bounds(r, 0, n, m, tile)
+            lefts[r, :i1 - i0 + 1] = gap * np.arange(i0, i1 + 1)
+        del tops, lefts
+
+        rows, cols = spilled_edges(directory, n, m, tile, mode='w+')
+        rows[0] = gap * np.arange(m + 1)
+        cols[0] = gap * np.arange(n + 1)
+
+        worker_args = (aligner, seq1, seq2, tile, local, live_shm.name, directory)
+        results = _wavefront(n_rows, n_cols, jobs, worker_args)
+
+        if local:
+            # Primer máximo en orden de filas, como find_max
+            _, _, score, start = max(results, key=lambda result: (result[2], -result[3][0], -result[3][1]))
+        else:
+            score, start = int(rows[n_rows, m]), (n, m)
+        aligned_seq1, aligned_seq2 = _tiled_traceback(aligner, seq1, seq2, rows, cols, tile, start, local)
+        del rows, cols
+    finally:
+        live_shm.close()
+        live_shm.unlink()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    return aligned_seq1, aligned_seq2, score, start
+
+
+def parallel_alignment(aligner, seq1, seq2, jobs=None, tile=512, spill_dir=None):
+    """
+    parallel_traceback con el resultado de alignment(): (alineada1, alineada2, puntuación, None)
+    """
+    aligned_seq1, aligned_seq2, score, _ = parallel_traceback(aligner, seq1, seq2, jobs, tile, spill_dir)
+    return aligned_seq1, aligned_seq2, score, None
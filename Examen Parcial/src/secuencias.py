@@ -0,0 +1,150 @@
+ALPHABETS = {
+    "dna": "ACGT",
+    "protein": "ACDEFGHIKLMNPQRSTVWY",
+}
+
+
+def _or_bytes(chunks, length):
+    """
+    OR byte a byte de varios bloques del mismo largo (vía enteros grandes, en C)
+    """
+    value = 0
+    for chunk in chunks:
+        value |= int.from_bytes(chunk, 'little')
+    return value.to_bytes(length, 'little')
+
+
+def pack_2bit(codes):
+    """
+    Empaqueta códigos 0..3 a 2 bits (4 residuos por byte)
+    """
+    codes = bytes(codes) + b'\x00' * (-len(codes) % 4)
+    length = len(codes) // 4
+    shifts = [bytes((c << (2 * k)) & 0xFF for c in range(256)) for k in range(4)]
+    return _or_bytes((codes[k::4].translate(shifts[k]) for k in range(4)), length)
+
+
+def unpack_2bit(packed, length):
+    """
+    Inversa de pack_2bit: devuelve un código por byte
+    """
+    value = int.from_bytes(packed, 'little')
+    mask = int.from_bytes(b'\x03' * len(packed), 'little')
+
+    codes = bytearray(len(packed) * 4)
+    for k in range(4):
+        codes[k::4] = ((value >> (2 * k)) & mask).to_bytes(len(packed), 'little')
+    return bytes(codes[:length])
+
+
+class SecuenciaCodificada:
+    """
+    Secuencia guardada como un byte por residuo (código 0..k-1 del alfabeto),
+    o a 2 bits por base para ADN empaquetado.
+    - se puede usar donde se espera un str: len, indexado, slicing, str()
+    - codes / buffer exponen los códigos a los motores sin volver a codificar
+    """
+
+    def __init__(self, codes, alphabet, name="", packed=False):
+        self.alphabet = alphabet
+        self.name = name
+        self.packed = packed
+        self._length = len(codes)
+        self._data = pack_2bit(codes) if packed else bytes(codes)
+
+        # Tablas código -> carácter
+        decode = bytearray(256)
+        for code, residue in enumerate(alphabet):
+            decode[code] = ord(residue)
+        self._decode = bytes(decode)
+
+    @classmethod
+    def from_string(cls, seq, alphabet="dna", name="", packed=False):
+        """
+        Valida y codifica una secuencia en una sola pasada de bytes.translate.
+        - alphabet: "dna", "protein" o un alfabeto explícito
+        - packed=True empaqueta a 2 bits (solo alfabetos de hasta 4 residuos)
+        """
+        alphabet = ALPHABETS.get(alphabet, alphabet)
+        if packed and len(alphabet) > 4:
+            raise ValueError("Solo se pueden empaquetar a 2 bits alfabetos de hasta 4 residuos")
+
+        try:
+            raw = seq.encode('ascii').upper()
+        except UnicodeEncodeError:
+            raise ValueError("La secuencia contiene caracteres no ASCII")
+
+        invalid = raw.translate(None, alphabet.encode('ascii'))
+        if invalid:
+            raise ValueError(f"Residuo '{chr(invalid[0])}' no válido para el alfabeto {alphabet}")
+
+        encode = bytearray(256)
+        for code, residue in enumerate(alphabet):
+            encode[ord(residue)] = code
+        return cls(raw.translate(encode), alphabet, name, packed)
+
+    @property
+    def codes(self):
+        """
+        Códigos como bytes (sin copia si no está empaquetada)
+        """
+        if self.packed:
+            return unpack_2bit(self._data, self._length)
+        return self._data
+
+    @property
+    def buffer(self):
+        return memoryview(self.codes)
+
+    @property
+    def nbytes(self):
+        return len(self._data)
+
+    def to_numpy(self):
+        """
+        Vista uint8 de los códigos (requiere NumPy)
+        """
+        import numpy as np
+        return np.frombuffer(self.codes, dtype=np.uint8)
+
+    def recode(self, table):
+        """
+        Traduce los códigos a otro alfabeto; table mapea carácter -> código nuevo
+        """
+        remap = bytes(table[ord(residue)] for residue in self.alphabet) + bytes(256 - len(self.alphabet))
+        return self.codes.translate(remap)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SecuenciaCodificada(self.codes[index], self.alphabet, self.name)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Índice fuera de la secuencia")
+        if self.packed:
+            code = (self._data[index // 4] >> (2 * (index % 4))) & 3
+        else:
+            code = self._data[index]
+        return self.alphabet[code]
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __str__(self):
+        return self.codes.translate(self._decode).decode('ascii')
+
+    def __eq__(self, other):
+        if isinstance(other, SecuenciaCodificada):
+            return self.alphabet == other.alphabet and self.codes == other.codes
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return f"SecuenciaCodificada({self.name!r}, {self._length} residuos, alphabet={self.alphabet!r})"
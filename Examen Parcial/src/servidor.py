@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .busqueda import align_batch
+
+# Uso (desde "Examen Parcial"):
+#   python -m src.servidor --socket /tmp/alineamientos.sock --jobs 4
+#   python -m src.servidor --port 8765
+# Protocolo: una petición JSON por línea, una respuesta JSON por línea con el mismo "id":
+#   {"id": 1, "algorithm": "sw", "params": {"gap": -2}, "seq1": "ACGT", "seq2": "AGT"}
+#   {"id": 1, "score": 1, "aligned1": "GT", "aligned2": "GT"}
+
+# Línea más larga aceptada (secuencias largas en una sola petición)
+MAX_LINE = 1 << 26
+
+# ===============================================================================
+class ServidorAlineamiento:
+    """
+    Servicio de alineamientos de larga duración sobre un socket Unix (path) o TCP local.
+    - protocolo JSON por líneas: cada petición recibe una respuesta con su "id",
+      en orden de finalización (ver align_request)
+    - las peticiones de todas las conexiones se agrupan en lotes de hasta batch_size
+      (esperando como mucho batch_wait segundos) para un pool de procesos caliente
+    - contrapresión: la cola admite max_queue peticiones; llena, se deja de leer de
+      los sockets. Como mucho 2 * jobs lotes están en el pool a la vez.
+    """
+
+    def __init__(self, path=None, host="127.0.0.1", port=0, jobs=None, batch_size=64,
+                 batch_wait=0.002, max_queue=1024):
+        if batch_size < 1 or max_queue < 1:
+            raise ValueError("batch_size y max_queue deben ser al menos 1")
+        self.path = path
+        self.host = host
+        self.port = port
+        self.jobs = jobs or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_queue = max_queue
+
+        self.address = None
+        self.requests = 0
+        self.batches = 0
+        self._server = None
+        self._pool = None
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._running = set()
+
+    async def start(self):
+        """
+        Crea el pool y empieza a escuchar; address queda con la ruta o (host, puerto)
+        """
+        if self.jobs == 1:
+            self._pool = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(2 * self.jobs)
+        # Pool caliente: los procesos se crean ahora, no con la primera petición
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, align_batch, []) for _ in range(self.jobs)))
+        self._batcher = loop.create_task(self._make_batches())
+
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=MAX_LINE)
+            self.address = self.path
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_LINE)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Deja de aceptar conexiones, termina los lotes en curso y cierra el pool
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        self._batcher.cancel()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        self._pool.shutdown()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    async def _handle(self, reader, writer):
+        """
+        Una conexión: lee peticiones y escribe cada respuesta cuando su lote termina
+        """
+        loop = asyncio.get_running_loop()
+        lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("la petición debe ser un objeto JSON")
+                except ValueError as error:
+                    await self._reply(writer, lock, {"id": None, "error": f"ValueError: {error}"})
+                    continue
+
+                future = loop.create_future()
+                # Contrapresión: con la cola llena, esta conexión deja de leer
+                await self._queue.put((request, future))
+                self.requests += 1
+                task = loop.create_task(self._respond(writer, lock, future))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, lock, future):
+        await self._reply(writer, lock, await future)
+
+    async def _reply(self, writer, lock, response):
+        async with lock:
+            writer.write(json.dumps(response).encode('utf-8') + b"\n")
+            await writer.drain()
+
+    async def _make_batches(self):
+        """
+        Toma la primera petición en espera y las que lleguen en batch_wait segundos
+        (hasta batch_size) y las manda juntas al pool
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_wait)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            await self._slots.acquire()
+            self.batches += 1
+            task = loop.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch):
+        requests = [request for request, _ in batch]
+        try:
+            responses = await asyncio.get_running_loop().run_in_executor(self._pool, align_batch, requests)
+        except Exception as error:
+            responses = [{"id": request.get("id"), "error": f"{type(error).__name__}: {error}"}
+                         for request in requests]
+        finally:
+            self._slots.release()
+
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+
+def connect(address):
+    """
+    Socket conectado al servidor: address es la ruta del socket Unix o (host, puerto)
+    """
+    if isinstance(address, (str, os.PathLike)):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+def align_many(address, requests):
+    """
+    Cliente: envía las peticiones por una sola conexión (desde un hilo, para no bloquearse
+    con la contrapresión del servidor) y genera las respuestas a medida que llegan
+    """
+    sock = connect(address)
+
+    def send():
+        try:
+            with sock.makefile('w', encoding='utf-8') as stream:
+                for request in requests:
+                    stream.write(json.dumps(request) + "\n")
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    sender = threading.Thread(target=send, daemon=True)
+    sender.start()
+    try:
+        with sock.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                yield json.loads(line)
+    finally:
+        sender.join()
+        sock.close()
+
+
+async def serve(**options):
+    server = await ServidorAlineamiento(**options).start()
+    print(f"Servidor de alineamientos escuchando en {server.address}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de alineamientos (JSON por líneas)")
+    parser.add_argument("--socket", dest="path", help="ruta del socket Unix (por defecto, TCP local)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs", type=int, help="procesos del pool (por defecto, todos los núcleos)")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-wait", type=float, default=0.002, help="segundos de espera para llenar un lote")
+    parser.add_argument("--max-queue", type=int, default=1024, help="peticiones en cola antes de dejar de leer")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(path=args.path, host=args.host, port=args.port, jobs=args.jobs,
+                          batch_size=args.batch_size, batch_wait=args.batch_wait, max_queue=args.max_queue))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
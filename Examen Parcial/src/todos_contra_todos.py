@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .busqueda import get_algorithm, driver_mode, pool_map
+from .utils import calculate_identity, read_fasta
+
+# Estado de cada proceso del pool (se crea una vez en el inicializador)
+_worker = {}
+
+
+def _init_worker(shm_name, sequences, algorithm, params, metric):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    n = len(sequences)
+    _worker['shm'] = shm
+    _worker['result'] = np.ndarray((n, n), dtype=np.float64, buffer=shm.buf)
+    _worker['sequences'] = sequences
+    _worker['aligner'] = get_algorithm(algorithm)(**params)
+    _worker['metric'] = metric
+
+
+def _pair_value(aligner, seq1, seq2, metric):
+    if metric == "score":
+        return aligner.score_only(seq1, seq2)
+    aligned1, aligned2, _, _ = aligner.alignment(seq1, seq2, mode=driver_mode(aligner, "linear"))
+    return calculate_identity(aligned1, aligned2)
+
+
+def _compute_tile(block):
+    """
+    Calcula un bloque (filas, columnas) del triángulo superior y lo escribe (simétrico)
+    en la memoria compartida
+    """
+    rows, cols = block
+    result = _worker['result']
+    sequences = _worker['sequences']
+    for i in range(*rows):
+        for j in range(max(i, cols[0]), cols[1]):
+            value = _pair_value(_worker['aligner'], sequences[i], sequences[j], _worker['metric'])
+            result[i, j] = value
+            result[j, i] = value
+    return block
+
+
+def _tiles(n, tile):
+    """
+    Bloques (filas, columnas) que cubren el triángulo superior, diagonal incluida
+    """
+    for start_i in range(0, n, tile):
+        for start_j in range(start_i, n, tile):
+            yield (start_i, min(start_i + tile, n)), (start_j, min(start_j + tile, n))
+
+
+def _tile_path(checkpoint_dir, rows, cols):
+    return os.path.join(checkpoint_dir, f"tile_{rows[0]}_{cols[0]}.npy")
+
+
+def _sequences_digest(sequences):
+    """
+    SHA-256 de las secuencias en orden (cada una con su largo, para que no se confundan los límites)
+    """
+    digest = hashlib.sha256()
+    for seq in sequences:
+        data = str(seq).encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _prepare_checkpoint(checkpoint_dir, meta):
+    """
+    Crea el directorio de checkpoints o verifica que corresponda a la misma ejecución
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    meta_path = os.path.join(checkpoint_dir, "meta.json")
+
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            if json.load(f) != meta:
+                raise ValueError(f"El checkpoint {checkpoint_dir} corresponde a otra ejecución")
+    else:
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+
+def _save_tile(checkpoint_dir, result, rows, cols):
+    """
+    Guarda un bloque terminado (escritura atómica: archivo temporal + replace)
+    """
+    path = _tile_path(checkpoint_dir, rows, cols)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, result[rows[0]:rows[1], cols[0]:cols[1]])
+    os.replace(tmp_path, path)
+
+
+def all_vs_all(sequences, metric="score", algorithm="sw", jobs=None, tile=16,
+               checkpoint_dir=None, **params):
+    """
+    Matriz densa de puntuaciones o identidades de todos contra todos.
+    - sequences: lista de secuencias, de (encabezado, secuencia) o ruta de un FASTA
+    - metric: "score" (score_only) o "identity" (calculate_identity del alineamiento)
+    - solo se calcula el triángulo superior, en bloques de tile x tile repartidos
+      en un pool que escribe en un arreglo NumPy de memoria compartida
+    - checkpoint_dir: cada bloque terminado se guarda en disco; al relanzar con el
+      mismo directorio solo se calculan los bloques que faltan (si las secuencias o
+      los parámetros cambiaron, ValueError)
+    - params: match, mismatch, gap, substitution_matrix...
+    """
+    if metric not in ("score", "identity"):
+        raise ValueError(f"Métrica desconocida: {metric}")
+
+    if isinstance(sequences, (str, os.PathLike)):
+        sequences = [seq for _, seq in read_fasta(sequences)]
+    sequences = [seq[1] if isinstance(seq, tuple) else seq for seq in sequences]
+
+    n = len(sequences)
+    jobs = jobs or os.cpu_count() or 1
+    tiles = list(_tiles(n, tile))
+
+    shm = shared_memory.SharedMemory(create=True, size=max(n * n * 8, 1))
+    try:
+        result = np.ndarray((n, n), dtype=np.float64, buffer=shm.buf)
+        result[:] = 0
+
+        if checkpoint_dir is not None:
+            meta = {"n": n, "tile": tile, "metric": metric, "algorithm": algorithm,
+                    "params": {key: str(value) for key, value in params.items()},
+                    "sequences": _sequences_digest(sequences)}
+            _prepare_checkpoint(checkpoint_dir, meta)
+
+            pending_tiles = []
+            for rows, cols in tiles:
+                path = _tile_path(checkpoint_dir, rows, cols)
+                if os.path.exists(path):
+                    block = np.load(path)
+                    result[rows[0]:rows[1], cols[0]:cols[1]] = block
+                    result[cols[0]:cols[1], rows[0]:rows[1]] = block.T
+                else:
+                    pending_tiles.append((rows, cols))
+            tiles = pending_tiles
+
+        worker_args = (shm.name, sequences, algorithm, params, metric)
+        for (rows, cols), _ in pool_map(_compute_tile, tiles, jobs, _init_worker, worker_args):
+            if checkpoint_dir is not None:
+                _save_tile(checkpoint_dir, result, rows, cols)
+        if jobs == 1:
+            # Estado del "proceso" creado en este mismo proceso
+            _worker.pop('result')
+            _worker.pop('shm').close()
+
+        # Copia fuera de la memoria compartida antes de liberarla
+        matrix = result.copy()
+        del result
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return matrix
@@ -1,3 +1,13 @@
+import mmap
+import os
+import re
+from collections import namedtuple
+
+# Estadísticas de un alineamiento (ver alignment_stats)
+EstadisticasAlineamiento = namedtuple('EstadisticasAlineamiento',
+                                      ['length', 'matches', 'mismatches', 'gaps', 'identity'])
+
+
 def calculate_identity(aligned1, aligned2):
     """
     Calcula el porcentaje de identidad entre dos secuencias alineadas
@@ -32,41 +42,202 @@ def count_mismatches(aligned1, aligned2):
     return sum(1 for a, b in zip(aligned1, aligned2) if a != b and a != '-' and b != '-')
 
 
+def alignment_stats(aligned1, aligned2):
+    """
+    Matches, mismatches, gaps e identidad en una sola pasada
+    (mismos valores que count_matches, count_mismatches, count_gaps y calculate_identity)
+    """
+    if len(aligned1) != len(aligned2):
+        raise ValueError("Las secuencias alineadas deben tener la misma longitud")
+
+    matches = mismatches = gaps = 0
+    for a, b in zip(aligned1, aligned2):
+        if a == '-' or b == '-':
+            gaps += (a == '-') + (b == '-')
+        elif a == b:
+            matches += 1
+        else:
+            mismatches += 1
+
+    total = len(aligned1)
+    identity = (matches / total) * 100 if total > 0 else 0
+    return EstadisticasAlineamiento(total, matches, mismatches, gaps, identity)
+
+
+def _only_chars(sequence, valid_chars):
+    """
+    Comprueba en bloque (bytes.translate) que la secuencia solo use valid_chars, sin
+    distinguir mayúsculas. Las secuencias codificadas se validan por su alfabeto.
+    """
+    if hasattr(sequence, 'alphabet'):
+        return set(sequence.alphabet) <= set(valid_chars)
+    try:
+        raw = sequence.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    return not raw.upper().translate(None, valid_chars.encode('ascii'))
+
+
 def validate_dna(sequence):
     """
     Valida que una secuencia sea ADN válido (solo A, C, G, T)
     """
-    valid_chars = set('ACGT')
-    return all(char.upper() in valid_chars for char in sequence)
+    return _only_chars(sequence, 'ACGT')
 
 
 def validate_protein(sequence):
     """
     Valida que una secuencia sea proteína válida (aminoácidos)
     """
-    valid_chars = set('ACDEFGHIKLMNPQRSTVWY')
-    return all(char.upper() in valid_chars for char in sequence)
+    return _only_chars(sequence, 'ACDEFGHIKLMNPQRSTVWY')
+
+
+# Bytes que no son letras ASCII (se eliminan de las líneas de secuencia)
+_NON_ALPHA = bytes(b for b in range(256) if not chr(b).isalpha() or b >= 128)
+
+
+# Inicio de una línea de encabezado: '>' tras espacios opcionales (como line.strip())
+_HEADER_START = re.compile(rb'\n[ \t\r\x0b\x0c]*>')
+_LINE_SPACE = b' \t\r\x0b\x0c'
+
+
+def _record_spans(data):
+    """
+    Genera (inicio, fin) de cada registro FASTA dentro de data (bytes o mmap).
+    El texto anterior al primer '>' se trata como un registro sin encabezado.
+    """
+    pos = 0
+    size = len(data)
+    while pos < size:
+        next_record = _HEADER_START.search(data, pos)
+        end = next_record.start() + 1 if next_record is not None else size
+        yield pos, end
+        pos = end
+
+
+def _parse_record(chunk):
+    """
+    Separa encabezado y secuencia de un registro:
+    - se ignoran comentarios ';'
+    - la secuencia queda solo con letras, en mayúsculas
+    """
+    stripped = chunk.lstrip(_LINE_SPACE)
+    if stripped.startswith(b'>'):
+        header, _, body = stripped[1:].partition(b'\n')
+    else:
+        header, body = b'', chunk
+
+    if b';' in body:
+        body = b'\n'.join(line for line in body.split(b'\n') if not line.lstrip().startswith(b';'))
+
+    sequence = body.translate(None, _NON_ALPHA).upper()
+    return header.strip().decode('utf-8', errors='replace'), sequence.decode('ascii')
+
+
+def _open_mmap(filepath):
+    """
+    Abre el archivo como mmap de solo lectura (None si está vacío)
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No se encontró el archivo: {filepath}")
+
+
+def read_fasta(filepath, with_offsets=False):
+    """
+    Lee un archivo FASTA (multi-registro) sobre un mmap y genera (encabezado, secuencia)
+    un registro a la vez, sin cargar el archivo completo en memoria.
+    - with_offsets=True: genera (encabezado, secuencia, inicio, fin) con los bytes del registro
+    """
+    data = _open_mmap(filepath)
+    if data is None:
+        return
+
+    try:
+        for start, end in _record_spans(data):
+            header, sequence = _parse_record(data[start:end])
+            if header or sequence:
+                yield (header, sequence, start, end) if with_offsets else (header, sequence)
+    finally:
+        data.close()
+
+
+class FastaIndex:
+    """
+    Índice de desplazamientos de un archivo FASTA para acceso aleatorio por ID.
+    - el ID es la primera palabra del encabezado
+    - solo se guardan los desplazamientos; las secuencias se leen del mmap al pedirlas
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.offsets = {}
+        self._data = _open_mmap(filepath)
+        if self._data is None:
+            return
+
+        for start, end in _record_spans(self._data):
+            line_end = self._data.find(b'\n', start, end)
+            header = self._data[start:line_end if line_end != -1 else end]
+            if header.startswith(b'>'):
+                fields = header[1:].split(maxsplit=1)
+                record_id = fields[0].decode('utf-8', errors='replace') if fields else ''
+                self.offsets[record_id] = (start, end)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, record_id):
+        return record_id in self.offsets
+
+    def __iter__(self):
+        return iter(self.offsets)
+
+    def __getitem__(self, record_id):
+        """
+        Devuelve (encabezado, secuencia) del registro record_id
+        """
+        if record_id not in self.offsets:
+            raise KeyError(f"No existe el registro {record_id} en {self.filepath}")
+        start, end = self.offsets[record_id]
+        return self.read_at(start, end)
+
+    def read_at(self, start, end):
+        """
+        Devuelve (encabezado, secuencia) del registro entre los bytes start y end
+        """
+        return _parse_record(self._data[start:end])
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
 def load_sequence_from_file(filepath):
     """
     Carga una secuencia desde un archivo de texto.
     - Formatos FASTA y texto plano.
+    - Si hay varios registros, se concatenan (ver read_fasta para leerlos por separado).
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            sequence = ''
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('>') and not line.startswith(';'):
-                    cleaned = ''.join(c for c in line if c.isalpha())
-                    sequence += cleaned
-            
-            if not sequence:
-                raise ValueError(f"El archivo {filepath} no contiene secuencia válida")
-            
-            return sequence.upper()
-    
+        sequence = ''.join(seq for _, seq in read_fasta(filepath))
+
+        if not sequence:
+            raise ValueError(f"El archivo {filepath} no contiene secuencia válida")
+
+        return sequence
+
     except FileNotFoundError:
         raise FileNotFoundError(f"No se encontró el archivo: {filepath}")
     except Exception as e:
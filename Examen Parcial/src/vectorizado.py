@@ -0,0 +1,303 @@
+import numpy as np
+
+from .algoritmos_alineamiento import (NeedlemanWunsch, SmithWaterman, MatrizPunteros,
+                                      STOP, DIAGONAL, UP, LEFT)
+
+
+def score_arrays(aligner, seq1, seq2):
+    """
+    Versión NumPy de AlgoritmoAlineamiento.score_table: códigos como arreglos y tabla int64.
+    La fila de puntuaciones de seq1[i-1] contra seq2 es table[codes1[i-1], codes2].
+    """
+    codes1, codes2, table = aligner.score_table(seq1, seq2)
+    codes1 = np.frombuffer(codes1, dtype=np.uint8) if isinstance(codes1, bytes) else np.asarray(codes1, dtype=np.intp)
+    codes2 = np.frombuffer(codes2, dtype=np.uint8) if isinstance(codes2, bytes) else np.asarray(codes2, dtype=np.intp)
+    return codes1, codes2, np.asarray(table, dtype=np.int64)
+
+
+def fill_row(prev_row, row, scores, gap, first, floor=None):
+    """
+    Calcula una fila completa de la matriz a partir de la fila anterior.
+    - diagonal y gap vertical se calculan en bloque
+    - el gap horizontal es un máximo acumulado: H[j] = gap*j + max_k<=j (D[k] - gap*k)
+    - floor=0 para Smith-Waterman
+    """
+    cols = len(row)
+    offsets = gap * np.arange(cols, dtype=np.int64)
+
+    row[0] = first
+    np.maximum(prev_row[:-1] + scores, prev_row[1:] + gap, out=row[1:])
+    if floor is not None:
+        np.maximum(row, floor, out=row)
+
+    row -= offsets
+    np.maximum.accumulate(row, out=row)
+    row += offsets
+    return row
+
+
+def row_directions(row, diagonal, vertical):
+    """
+    Direcciones de traceback de una fila (prioridad diagonal, arriba, izquierda)
+    """
+    directions = np.full(len(row), LEFT, dtype=np.uint8)
+    directions[1:][row[1:] == vertical] = UP
+    directions[1:][row[1:] == diagonal] = DIAGONAL
+    return directions
+
+
+def set_packed_row(pointers, i, directions):
+    """
+    Empaqueta 4 direcciones por byte y las escribe en la fila i de MatrizPunteros
+    """
+    padding = np.zeros(-len(directions) % 4, dtype=np.uint8)
+    groups = np.concatenate([directions, padding]).reshape(-1, 4)
+    packed = groups[:, 0] | groups[:, 1] << 2 | groups[:, 2] << 4 | groups[:, 3] << 6
+    start = i * pointers.stride
+    pointers.data[start:start + pointers.stride] = packed.astype(np.uint8).tobytes()
+
+
+# ===============================================================================
+class NeedlemanWunschNumpy(NeedlemanWunsch):
+    """
+    Needleman-Wunsch con llenado vectorizado fila por fila (NumPy)
+    """
+
+    def initialize_matrix(self, seq1, seq2):
+        """
+        Matriz int64 con la primera fila y columna inicializadas con gaps
+        """
+        rows = len(seq1) + 1
+        cols = len(seq2) + 1
+
+        matrix = np.zeros((rows, cols), dtype=np.int64)
+        matrix[:, 0] = self.gap * np.arange(rows)
+        matrix[0, :] = self.gap * np.arange(cols)
+        return matrix
+
+
+    def compact_view(self, matrix):
+        """
+        En el modo compacto, el llenado vectorizado trabaja sobre una vista NumPy del búfer
+        """
+        return matrix.to_numpy()
+
+
+    def fill_matrix(self, matrix, seq1, seq2):
+        """
+        Cada fila se calcula con operaciones de arreglos en lugar de celda por celda
+        """
+        codes1, codes2, table = score_arrays(self, seq1, seq2)
+
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1], codes2]
+            fill_row(matrix[i-1], matrix[i], scores, self.gap, self.gap * i)
+        return matrix
+
+
+    def fill_rows(self, seq1, seq2, first_row, first_col):
+        """
+        Versión vectorizada de NeedlemanWunsch.fill_rows (usada por los modos lineal y paralelo)
+        """
+        codes1, codes2, table = score_arrays(self, seq1, seq2)
+        prev_row = np.asarray(first_row, dtype=np.int64)
+
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1], codes2]
+            row = np.empty(len(seq2) + 1, dtype=np.int64)
+            fill_row(prev_row, row, scores, self.gap, first_col[i])
+            yield row
+            prev_row = row
+
+
+    def fill_pointers(self, seq1, seq2):
+        """
+        Versión vectorizada de NeedlemanWunsch.fill_pointers
+        """
+        codes1, codes2, table = score_arrays(self, seq1, seq2)
+        pointers = MatrizPunteros(len(seq1) + 1, len(seq2) + 1)
+        pointers.set_row(0, [STOP] + [LEFT] * len(seq2))
+        prev_row = self.gap * np.arange(len(seq2) + 1, dtype=np.int64)
+        row = np.empty(len(seq2) + 1, dtype=np.int64)
+
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1], codes2]
+            diagonal = prev_row[:-1] + scores
+            vertical = prev_row[1:] + self.gap
+            fill_row(prev_row, row, scores, self.gap, self.gap * i)
+
+            directions = row_directions(row, diagonal, vertical)
+            directions[0] = UP
+            set_packed_row(pointers, i, directions)
+            prev_row, row = row, prev_row
+        return pointers, int(prev_row[len(seq2)])
+
+
+    def score_only(self, seq1, seq2):
+        """
+        Igual que NeedlemanWunsch.score_only, con la puntuación como int de Python
+        """
+        return int(super().score_only(seq1, seq2))
+
+
+    def alignment(self, seq1, seq2, mode="matrix"):
+        """
+        Igual que NeedlemanWunsch.alignment, con la puntuación como int de Python
+        """
+        aligned_seq1, aligned_seq2, score, matrix = super().alignment(seq1, seq2, mode)
+        return aligned_seq1, aligned_seq2, int(score), matrix
+
+
+# ===============================================================================
+class SmithWatermanNumpy(SmithWaterman):
+    """
+    Smith-Waterman con llenado vectorizado fila por fila (NumPy)
+    """
+
+    def initialize_matrix(self, seq1, seq2):
+        """
+        Matriz int64 de ceros
+        """
+        return np.zeros((len(seq1) + 1, len(seq2) + 1), dtype=np.int64)
+
+
+    def compact_view(self, matrix):
+        """
+        En el modo compacto, el llenado vectorizado trabaja sobre una vista NumPy del búfer
+        """
+        return matrix.to_numpy()
+
+
+    def fill_matrix(self, matrix, seq1, seq2):
+        """
+        Igual que NeedlemanWunschNumpy.fill_matrix, con máximo contra 0
+        """
+        codes1, codes2, table = score_arrays(self, seq1, seq2)
+
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1], codes2]
+            fill_row(matrix[i-1], matrix[i], scores, self.gap, 0, floor=0)
+        return matrix
+
+
+    def fill_rows(self, seq1, seq2, first_row=None, first_col=None):
+        """
+        Versión vectorizada de SmithWaterman.fill_rows (usada por score_only y el modo paralelo)
+        """
+        codes1, codes2, table = score_arrays(self, seq1, seq2)
+        if first_row is None:
+            prev_row = np.zeros(len(seq2) + 1, dtype=np.int64)
+        else:
+            prev_row = np.asarray(first_row, dtype=np.int64)
+
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1], codes2]
+            row = np.empty(len(seq2) + 1, dtype=np.int64)
+            fill_row(prev_row, row, scores, self.gap, first_col[i] if first_col is not None else 0, floor=0)
+            yield row
+            prev_row = row
+
+
+    def anchored_rows(self, seq1, seq2):
+        """
+        Versión vectorizada de SmithWaterman.anchored_rows (pasada inversa del modo lineal)
+        """
+        codes1, codes2, table = score_arrays(self, seq1, seq2)
+        prev_row = self.gap * np.arange(len(seq2) + 1, dtype=np.int64)
+
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1], codes2]
+            row = np.empty(len(seq2) + 1, dtype=np.int64)
+            fill_row(prev_row, row, scores, self.gap, self.gap * i)
+            yield row
+            prev_row = row
+
+
+    def score_only(self, seq1, seq2):
+        """
+        Igual que SmithWaterman.score_only, con el máximo de cada fila en NumPy
+        """
+        if self.affine:
+            return super().score_only(seq1, seq2)
+        self.validate_seqs(seq1, seq2)
+
+        if len(seq2) > len(seq1):
+            seq1, seq2 = seq2, seq1
+
+        max_value = 0
+        for row in self.fill_rows(seq1, seq2):
+            max_value = max(max_value, int(row.max()))
+        return max_value
+
+
+    def fill_pointers(self, seq1, seq2):
+        """
+        Versión vectorizada de SmithWaterman.fill_pointers
+        """
+        codes1, codes2, table = score_arrays(self, seq1, seq2)
+        pointers = MatrizPunteros(len(seq1) + 1, len(seq2) + 1)
+        prev_row = np.zeros(len(seq2) + 1, dtype=np.int64)
+        row = np.empty(len(seq2) + 1, dtype=np.int64)
+        max_value = 0
+        max_pos = (0, 0)
+
+        for i in range(1, len(seq1) + 1):
+            scores = table[codes1[i-1], codes2]
+            diagonal = prev_row[:-1] + scores
+            vertical = prev_row[1:] + self.gap
+            fill_row(prev_row, row, scores, self.gap, 0, floor=0)
+
+            directions = row_directions(row, diagonal, vertical)
+            directions[row == 0] = STOP
+            set_packed_row(pointers, i, directions)
+
+            j = int(np.argmax(row))
+            if row[j] > max_value:
+                max_value = int(row[j])
+                max_pos = (i, j)
+            prev_row, row = row, prev_row
+        return pointers, max_pos, max_value
+
+
+    def find_end(self, seq1, seq2):
+        """
+        Igual que SmithWaterman.find_end, con argmax por fila
+        """
+        max_value = 0
+        max_pos = (0, 0)
+
+        for i, row in enumerate(self.fill_rows(seq1, seq2), start=1):
+            j = int(np.argmax(row))
+            if row[j] > max_value:
+                max_value = int(row[j])
+                max_pos = (i, j)
+        return max_pos, max_value
+
+
+    def find_start(self, seq1, seq2, max_pos, max_value):
+        """
+        Igual que SmithWaterman.find_start, buscando max_value en bloque
+        """
+        i_end, j_end = max_pos
+        rows_back = 0
+        cols_back = 0
+
+        for r, row in enumerate(self.anchored_rows(seq1[:i_end][::-1], seq2[:j_end][::-1]), start=1):
+            hits = np.flatnonzero(row == max_value)
+            if len(hits):
+                rows_back = r
+                cols_back = max(cols_back, int(hits[-1]))
+        return i_end - rows_back, j_end - cols_back
+
+
+    def find_max(self, matrix):
+        """
+        argmax devuelve la primera posición en orden de filas, igual que el recorrido original
+        """
+        matrix = np.asarray(matrix)
+        flat_pos = int(np.argmax(matrix))
+        max_pos = divmod(flat_pos, matrix.shape[1])
+        max_value = int(matrix[max_pos])
+        if max_value <= 0:
+            return (0, 0), 0
+        return max_pos, max_value
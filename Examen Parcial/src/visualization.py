@@ -1,77 +1,92 @@
-from .utils import calculate_identity, count_gaps, count_matches, count_mismatches
+from .utils import EstadisticasAlineamiento, alignment_stats
 import os
 
+# Tamaño de los trozos en que se escriben las secuencias originales
+CHUNK_SIZE = 65536
 
-def save_alignment_to_file(seq1, seq2, aligned1, aligned2, score, algorithm="", filename="output.txt", line_width=80):
+
+def match_line(section1, section2):
+    """
+    Línea de coincidencias: | match, . mismatch, espacio en gaps
+    """
+    return ''.join(' ' if a == '-' or b == '-' else '|' if a == b else '.'
+                   for a, b in zip(section1, section2))
+
+
+def write_alignment_report(f, seq1, seq2, aligned1, aligned2, score, algorithm="", line_width=80):
+    """
+    Escribe el reporte por bloques en un archivo abierto, en una sola pasada:
+    - las secuencias se escriben en trozos de CHUNK_SIZE, sin copiarlas enteras
+    - las estadísticas se acumulan mientras se escriben los bloques
+    Memoria extra constante (un bloque a la vez). Devuelve EstadisticasAlineamiento.
+    """
+    if len(aligned1) != len(aligned2):
+        raise ValueError("Las secuencias alineadas deben tener la misma longitud")
+
+    # Encabezado
+    f.write("="*80 + "\n")
+    f.write(f"{algorithm:^80}\n")
+    f.write("="*80 + "\n\n")
+
+    # Información de secuencias originales
+    for number, seq in ((1, seq1), (2, seq2)):
+        f.write(f"Secuencia {number} original ({len(seq)} caracteres):\n")
+        for start in range(0, len(seq), CHUNK_SIZE):
+            f.write(str(seq[start:start + CHUNK_SIZE]))
+        f.write("\n\n")
+
+    f.write("="*80 + "\n")
+    f.write("ALINEAMIENTO COMPLETO\n")
+    f.write("="*80 + "\n\n")
+
+    # Bloques de line_width caracteres
+    matches = mismatches = gaps = 0
+    for start in range(0, len(aligned1), line_width):
+        end = min(start + line_width, len(aligned1))
+        section1 = aligned1[start:end]
+        section2 = aligned2[start:end]
+        line = match_line(section1, section2)
+
+        matches += line.count('|')
+        mismatches += line.count('.')
+        gaps += section1.count('-') + section2.count('-')
+
+        f.write(f"Posición {start+1}-{end}:\n"
+                f"Seq1: {section1}\n"
+                f"      {line}\n"
+                f"Seq2: {section2}\n"
+                "\n")
+
+    # Estadísticas
+    total = len(aligned1)
+    identity = (matches / total) * 100 if total > 0 else 0
+
+    f.write("="*80 + "\n")
+    f.write("ESTADÍSTICAS\n")
+    f.write("="*80 + "\n\n")
+
+    f.write(f"Puntuación total:        {score}\n")
+    f.write(f"Longitud alineamiento:   {total} caracteres\n")
+    f.write(f"Matches:                 {matches}\n")
+    f.write(f"Mismatches:              {mismatches}\n")
+    f.write(f"Gaps totales:            {gaps}\n")
+    f.write(f"Identidad:               {identity:.2f}%\n")
+
+    return EstadisticasAlineamiento(total, matches, mismatches, gaps, identity)
+
+
+def save_alignment_to_file(seq1, seq2, aligned1, aligned2, score, algorithm="", filename="output.txt", line_width=80,
+                           output_dir="output"):
     """
     Guarda el alineamiento completo en un archivo de texto con formato legible.
-    Divide las líneas largas en múltiples líneas.
+    Divide las líneas largas en múltiples líneas (ver write_alignment_report).
+    - output_dir: directorio de salida (se crea si no existe); filename puede ser una ruta absoluta
     """
-    # Crear directorio output si no existe
-    os.makedirs('output', exist_ok=True)
-    filepath = os.path.join('output', filename)
-    
+    filepath = os.path.join(output_dir, filename)
+    os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+
     with open(filepath, 'w', encoding='utf-8') as f:
-        # Encabezado
-        f.write("="*80 + "\n")
-        f.write(f"{algorithm:^80}\n")
-        f.write("="*80 + "\n\n")
-        
-        # Información de secuencias originales
-        f.write(f"Secuencia 1 original ({len(seq1)} caracteres):\n")
-        f.write(f"{seq1}\n\n")
-        
-        f.write(f"Secuencia 2 original ({len(seq2)} caracteres):\n")
-        f.write(f"{seq2}\n\n")
-        
-        f.write("="*80 + "\n")
-        f.write("ALINEAMIENTO COMPLETO\n")
-        f.write("="*80 + "\n\n")
-        
-        # Dividir el alineamiento en bloques de line_width caracteres
-        num_blocks = (len(aligned1) + line_width - 1) // line_width
-        
-        for block in range(num_blocks):
-            start = block * line_width
-            end = min(start + line_width, len(aligned1))
-            
-            # Extraer secciones
-            section1 = aligned1[start:end]
-            section2 = aligned2[start:end]
-            
-            # Crear línea de matching
-            match_line = ""
-            for i in range(len(section1)):
-                if section1[i] == section2[i] and section1[i] != '-':
-                    match_line += "|"
-                elif section1[i] == '-' or section2[i] == '-':
-                    match_line += " "
-                else:
-                    match_line += "."
-            
-            # Escribir bloque
-            f.write(f"Posición {start+1}-{end}:\n")
-            f.write(f"Seq1: {section1}\n")
-            f.write(f"      {match_line}\n")
-            f.write(f"Seq2: {section2}\n")
-            f.write("\n")
-        
-        # Estadísticas
-        f.write("="*80 + "\n")
-        f.write("ESTADÍSTICAS\n")
-        f.write("="*80 + "\n\n")
-        
-        matches = count_matches(aligned1, aligned2)
-        mismatches = count_mismatches(aligned1, aligned2)
-        gaps = count_gaps(aligned1) + count_gaps(aligned2)
-        identity = calculate_identity(aligned1, aligned2)
-        
-        f.write(f"Puntuación total:        {score}\n")
-        f.write(f"Longitud alineamiento:   {len(aligned1)} caracteres\n")
-        f.write(f"Matches:                 {matches}\n")
-        f.write(f"Mismatches:              {mismatches}\n")
-        f.write(f"Gaps totales:            {gaps}\n")
-        f.write(f"Identidad:               {identity:.2f}%\n")
+        write_alignment_report(f, seq1, seq2, aligned1, aligned2, score, algorithm, line_width)
 
     return filepath
 
@@ -139,66 +154,38 @@ def print_alignment(seq1, seq2, aligned1, aligned2, score, algorithm="", max_dis
     
     # Para alineamientos largos, mostrar inicio y fin
     if len(aligned1) > max_display:
-        # Inicio
-        match_line_start = ""
-        for i in range(40):
-            if aligned1[i] == aligned2[i]:
-                match_line_start += "|"
-            elif aligned1[i] == '-' or aligned2[i] == '-':
-                match_line_start += " "
-            else:
-                match_line_start += "."
-        
-        # Fin
-        match_line_end = ""
-        for i in range(len(aligned1) - 40, len(aligned1)):
-            if aligned1[i] == aligned2[i]:
-                match_line_end += "|"
-            elif aligned1[i] == '-' or aligned2[i] == '-':
-                match_line_end += " "
-            else:
-                match_line_end += "."
+        # Inicio y fin
+        match_line_start = match_line(aligned1[:40], aligned2[:40])
+        match_line_end = match_line(aligned1[-40:], aligned2[-40:])
         
         print(f"Alineamiento 1: {aligned1[:40]}...{aligned1[-40:]}")
         print(f"                {match_line_start}   {match_line_end}")
         print(f"Alineamiento 2: {aligned2[:40]}...{aligned2[-40:]}")
         print(f"                (Total: {len(aligned1)} caracteres)")
     else:
-        # Crear línea de matching completa
-        match_line = ""
-        for i in range(len(aligned1)):
-            if aligned1[i] == aligned2[i]:
-                match_line += "|"
-            elif aligned1[i] == '-' or aligned2[i] == '-':
-                match_line += " "
-            else:
-                match_line += "."
-        
         print(f"Alineamiento 1: {aligned1}")
-        print(f"                {match_line}")
+        print(f"                {match_line(aligned1, aligned2)}")
         print(f"Alineamiento 2: {aligned2}")
     
     print()
     print(f"Puntuación total: {score}")
     
     # Estadísticas
-    matches = count_matches(aligned1, aligned2)
-    mismatches = count_mismatches(aligned1, aligned2)
-    gaps = count_gaps(aligned1) + count_gaps(aligned2)
-    identity = calculate_identity(aligned1, aligned2)
+    stats = alignment_stats(aligned1, aligned2)
     
     print(f"\nEstadísticas:")
-    print(f"  - Matches:    {matches}")
-    print(f"  - Mismatches: {mismatches}")
-    print(f"  - Gaps:       {gaps}")
-    print(f"  - Identidad:  {identity:.1f}%")
+    print(f"  - Matches:    {stats.matches}")
+    print(f"  - Mismatches: {stats.mismatches}")
+    print(f"  - Gaps:       {stats.gaps}")
+    print(f"  - Identidad:  {stats.identity:.1f}%")
     print(f"{'='*60}\n")
 
 
-def print_alignment_colored(seq1, seq2, aligned1, aligned2, score, algorithm="", max_display=80, save_to_file=None):
+def print_alignment_colored(seq1, seq2, aligned1, aligned2, score, algorithm="", max_display=80, save_to_file=None,
+                            output_dir="output"):
     """
     Imprime el alineamiento con colores (requiere colorama).
-    Para secuencias largas, guarda en archivo y muestra solo estadísticas.
+    Para secuencias largas, guarda en archivo (dentro de output_dir) y muestra solo estadísticas.
     """
     # Si se especifica archivo o la secuencia es muy larga, guardar en archivo
     if save_to_file or len(aligned1) > max_display:
@@ -207,7 +194,8 @@ def print_alignment_colored(seq1, seq2, aligned1, aligned2, score, algorithm="",
             alg_name = algorithm.lower().replace(" ", "_").replace(":", "")
             save_to_file = f"{alg_name}.txt"
         
-        filepath = save_alignment_to_file(seq1, seq2, aligned1, aligned2, score, algorithm, save_to_file)
+        filepath = save_alignment_to_file(seq1, seq2, aligned1, aligned2, score, algorithm, save_to_file,
+                                          output_dir=output_dir)
         
         print(f"\n{'='*60}")
         print(f"{algorithm:^60}")
@@ -216,17 +204,14 @@ def print_alignment_colored(seq1, seq2, aligned1, aligned2, score, algorithm="",
         print(f"Longitud: {len(aligned1)} caracteres")
         
         # Mostrar solo estadísticas en consola
-        matches = count_matches(aligned1, aligned2)
-        mismatches = count_mismatches(aligned1, aligned2)
-        gaps = count_gaps(aligned1) + count_gaps(aligned2)
-        identity = calculate_identity(aligned1, aligned2)
+        stats = alignment_stats(aligned1, aligned2)
         
         print(f"\nEstadísticas:")
         print(f"  - Puntuación:  {score}")
-        print(f"  - Matches:     {matches}")
-        print(f"  - Mismatches:  {mismatches}")
-        print(f"  - Gaps:        {gaps}")
-        print(f"  - Identidad:   {identity:.1f}%")
+        print(f"  - Matches:     {stats.matches}")
+        print(f"  - Mismatches:  {stats.mismatches}")
+        print(f"  - Gaps:        {stats.gaps}")
+        print(f"  - Identidad:   {stats.identity:.1f}%")
         print(f"{'='*60}\n")
         return
     
@@ -246,7 +231,7 @@ def print_alignment_colored(seq1, seq2, aligned1, aligned2, score, algorithm="",
         # Colorear alineamiento completo
         colored_align1 = ""
         colored_align2 = ""
-        match_line = ""
+        colored_match = ""
         
         for i in range(len(aligned1)):
             char1 = aligned1[i]
@@ -255,34 +240,31 @@ def print_alignment_colored(seq1, seq2, aligned1, aligned2, score, algorithm="",
             if char1 == char2:
                 colored_align1 += Fore.GREEN + char1
                 colored_align2 += Fore.GREEN + char2
-                match_line += Fore.GREEN + "|"
+                colored_match += Fore.GREEN + "|"
             elif char1 == '-' or char2 == '-':
                 colored_align1 += Fore.RED + char1
                 colored_align2 += Fore.RED + char2
-                match_line += " "
+                colored_match += " "
             else:
                 colored_align1 += Fore.YELLOW + char1
                 colored_align2 += Fore.YELLOW + char2
-                match_line += Fore.YELLOW + "."
+                colored_match += Fore.YELLOW + "."
         
         print(f"Alineamiento 1: {colored_align1}")
-        print(f"                {match_line}")
+        print(f"                {colored_match}")
         print(f"Alineamiento 2: {colored_align2}")
         
         print()
         print(f"Puntuación total: {score}")
         
         # Estadísticas
-        matches = count_matches(aligned1, aligned2)
-        mismatches = count_mismatches(aligned1, aligned2)
-        gaps = count_gaps(aligned1) + count_gaps(aligned2)
-        identity = calculate_identity(aligned1, aligned2)
+        stats = alignment_stats(aligned1, aligned2)
         
         print(f"\nEstadísticas:")
-        print(f"  - Matches:    {Fore.GREEN}{matches}")
-        print(f"  - Mismatches: {Fore.YELLOW}{mismatches}")
-        print(f"  - Gaps:       {Fore.RED}{gaps}")
-        print(f"  - Identidad:  {identity:.1f}%")
+        print(f"  - Matches:    {Fore.GREEN}{stats.matches}")
+        print(f"  - Mismatches: {Fore.YELLOW}{stats.mismatches}")
+        print(f"  - Gaps:       {Fore.RED}{stats.gaps}")
+        print(f"  - Identidad:  {stats.identity:.1f}%")
         print(f"  - Longitud alineamiento: {len(aligned1)} caracteres")
         print(f"{'='*60}\n")
         
@@ -302,17 +284,17 @@ def compare_algorithms(seq1, seq2, nw_result, sw_result):
     nw_alin1, nw_alin2, nw_score, _ = nw_result
     sw_alin1, sw_alin2, sw_score, _ = sw_result
     
-    # Calcular identidades
-    nw_identity = calculate_identity(nw_alin1, nw_alin2)
-    sw_identity = calculate_identity(sw_alin1, sw_alin2)
+    # Estadísticas (una pasada por alineamiento)
+    nw_stats = alignment_stats(nw_alin1, nw_alin2)
+    sw_stats = alignment_stats(sw_alin1, sw_alin2)
     
     print(f"{'Métrica':<25} | {'Needleman-Wunsch (Global)':^25} | {'Smith-Waterman (Local)':^25}")
     print("-" * 80)
     print(f"{'Longitud original':<25} | {len(seq1):^25} | {len(seq2):^25}")
     print(f"{'Longitud alineamiento':<25} | {len(nw_alin1):^25} | {len(sw_alin1):^25}")
     print(f"{'Puntuación':<25} | {nw_score:^25} | {sw_score:^25}")
-    print(f"{'Identidad':<25} | {nw_identity:^24.1f}% | {sw_identity:^24.1f}%")
-    print(f"{'Matches':<25} | {count_matches(nw_alin1, nw_alin2):^25} | {count_matches(sw_alin1, sw_alin2):^25}")
-    print(f"{'Gaps':<25} | {count_gaps(nw_alin1) + count_gaps(nw_alin2):^25} | {count_gaps(sw_alin1) + count_gaps(sw_alin2):^25}")
+    print(f"{'Identidad':<25} | {nw_stats.identity:^24.1f}% | {sw_stats.identity:^24.1f}%")
+    print(f"{'Matches':<25} | {nw_stats.matches:^25} | {sw_stats.matches:^25}")
+    print(f"{'Gaps':<25} | {nw_stats.gaps:^25} | {sw_stats.gaps:^25}")
     
     print(f"{'='*80}\n")
\ No newline at end of file
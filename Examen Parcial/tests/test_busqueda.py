@@ -0,0 +1,137 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from src.busqueda import search
+from src.todos_contra_todos import all_vs_all
+from src.heuristica import IndiceKmer, seeded_search, seed_scores, xdrop_extend
+from src.utils import read_fasta, load_sequence_from_file, count_matches, calculate_identity
+from src.algoritmos_alineamiento import NeedlemanWunsch, SmithWaterman
+
+print("="*80)
+print(" TEST: BUSQUEDA UNO CONTRA MUCHOS ".center(80, " "))
+print("="*80)
+
+consulta = load_sequence_from_file('examples/hemoglobin-homo-sapiens.txt')
+registros = [registro for filename in sorted(os.listdir('examples'))
+             for registro in read_fasta(os.path.join('examples', filename))]
+
+# CASO 1: Pool de procesos vs ejecución en serie
+paralelo = sorted(search(consulta, registros, algorithm="sw", jobs=2), key=lambda r: r.record)
+serie = sorted(search(consulta, registros, algorithm="sw", jobs=1), key=lambda r: r.record)
+print(f"Resultados: {len(paralelo)} registros | Test: {'PASS' if paralelo == serie else 'FAIL'}")
+
+# CASO 2: Top-N por puntuación
+mejores = list(search(consulta, registros, algorithm="sw", jobs=2, top_n=2, score_only=True))
+for resultado in mejores:
+    print(f"  {resultado.score:>5}  {resultado.record}")
+esperado = sorted((r.score for r in serie), reverse=True)[:2]
+print(f"Top-2 | Test: {'PASS' if [r.score for r in mejores] == esperado else 'FAIL'}")
+
+# CASO 3: Todos contra todos con checkpoints reanudables
+secuencias = [secuencia for _, secuencia in registros]
+checkpoint_dir = tempfile.mkdtemp()
+identidades = all_vs_all(secuencias, metric="identity", algorithm="nw", jobs=2, tile=2,
+                         checkpoint_dir=checkpoint_dir)
+os.remove(os.path.join(checkpoint_dir, "tile_0_2.npy"))
+reanudada = all_vs_all(secuencias, metric="identity", algorithm="nw", jobs=2, tile=2,
+                       checkpoint_dir=checkpoint_dir)
+try:
+    all_vs_all([secuencia[::-1] for secuencia in secuencias], metric="identity", algorithm="nw", jobs=2, tile=2,
+               checkpoint_dir=checkpoint_dir)
+    rechazado = False
+except ValueError:
+    rechazado = True
+shutil.rmtree(checkpoint_dir)
+ok = (identidades == reanudada).all() and (identidades == identidades.T).all() and rechazado
+print(f"Matriz de identidad {identidades.shape}, checkpoint de otras secuencias rechazado | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 4: Búsqueda con semillas de k-mers (semilla, extensión X-drop, SW)
+indice = IndiceKmer.build(registros, k=5, alphabet="protein")
+semillas = list(seeded_search(consulta, indice, algorithm="sw", jobs=1))
+esperado = [r for r in serie if r.record in {s.record for s in semillas}]
+ok = len(semillas) == 2 and sorted(semillas, key=lambda r: r.record) == esperado
+print(f"Candidatos tras semillas: {len(semillas)} de {len(registros)} | Test: {'PASS' if ok else 'FAIL'}")
+
+# La extensión cubre su diagonal hasta el final del segmento: contra sí misma, una sola extensión
+propio = IndiceKmer.build([("consulta", consulta)], k=5, alphabet="protein")
+alineador = SmithWaterman()
+puntuacion, fin = xdrop_extend(alineador, consulta, consulta, 0, 0, 5, 10)
+ok = fin == len(consulta) and seed_scores(consulta, propio, alineador)[0] == puntuacion
+print(f"Extensión X-drop hasta {fin} de {len(consulta)} | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 5: Índice de k-mers persistente en disco (cargado con mmap)
+directorio = tempfile.mkdtemp()
+fasta = os.path.join(directorio, "registros.fasta")
+with open(fasta, 'w') as f:
+    for encabezado, secuencia in registros:
+        f.write(f">{encabezado}\n{secuencia}\n")
+IndiceKmer.build(fasta, k=5, alphabet="protein").save()
+cargado = IndiceKmer.open(fasta)
+lecturas = []
+leer = cargado.record
+cargado.record = lambda registro: lecturas.append(registro) or leer(registro)
+semillas_disco = list(seeded_search(consulta, cargado, algorithm="sw", jobs=1))
+ok = len(cargado) == len(registros) and semillas_disco == semillas and len(lecturas) == len(set(lecturas))
+del cargado
+shutil.rmtree(directorio)
+print(f"Índice en disco: {len(semillas_disco)} candidatos | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 6: Resultados como CIGAR (tramos) en lugar de cadenas con gaps
+con_cigar = sorted(search(consulta, registros, algorithm="sw", jobs=2, cigar=True), key=lambda r: r.record)
+secuencias_por_id = dict(registros)
+ok = all(r.score == s.score and r.alignment.to_strings(consulta, secuencias_por_id[r.record]) == s.alignment
+         for r, s in zip(con_cigar, serie))
+print(f"Búsqueda con CIGAR: {con_cigar[0].alignment} | Test: {'PASS' if ok and len(con_cigar) == len(serie) else 'FAIL'}")
+
+# CASO 7: Línea de comandos (python -m src) en paralelo, sin cargar la visualización
+fasta = os.path.join(tempfile.mkdtemp(), "registros.fasta")
+with open(fasta, 'w') as f:
+    f.writelines(f">{header}\n{secuencia}\n" for header, secuencia in registros)
+salida = subprocess.run([sys.executable, "-X", "importtime", "-m", "src", 'examples/hemoglobin-homo-sapiens.txt', fasta,
+                         "--algorithm", "sw", "--jobs", "2", "--format", "jsonl"],
+                        capture_output=True, text=True, check=True)
+filas = sorted((json.loads(linea) for linea in salida.stdout.splitlines()), key=lambda fila: fila["subject"])
+ok = ([(fila["subject"], fila["score"], fila["matches"]) for fila in filas]
+      == [(r.record, r.score, count_matches(*r.alignment)) for r in serie]
+      and "src.visualization" not in salida.stderr)
+print(f"python -m src: {len(filas)} pares en JSONL | Test: {'PASS' if ok else 'FAIL'}")
+
+# Los modos de SW sin punteros también dan CIGAR (con la celda final para las coordenadas)
+for modo in ("linear", "compact", "parallel"):
+    salida = subprocess.run([sys.executable, "-m", "src", 'examples/hemoglobin-homo-sapiens.txt', fasta,
+                             "--jobs", "1", "--format", "jsonl", "--mode", modo], capture_output=True, text=True)
+    filas_modo = sorted((json.loads(linea) for linea in salida.stdout.splitlines()), key=lambda fila: fila["subject"])
+    ok = salida.returncode == 0 and filas_modo == filas
+    print(f"python -m src --mode {modo} | Test: {'PASS' if ok else 'FAIL'}")
+salida = subprocess.run([sys.executable, "-m", "src", 'examples/hemoglobin-homo-sapiens.txt', fasta,
+                         "--mode", "banded"], capture_output=True, text=True)
+shutil.rmtree(os.path.dirname(fasta))
+ok = salida.returncode == 2 and not salida.stdout and "local" in salida.stderr
+print(f"python -m src --mode banded (SW) rechazado | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 8: Gaps afines en los drivers (el modo por defecto "linear" pasa a "pointers")
+afines = {"gap_open": -5, "gap_extend": -1}
+sw_afin = SmithWaterman(**afines)
+nw_afin = NeedlemanWunsch(**afines)
+resultados = sorted(search(consulta, registros, algorithm="sw", jobs=2, **afines), key=lambda r: r.record)
+ok = [(r.record, r.score) for r in resultados] == sorted((h, sw_afin.alignment(consulta, s)[2]) for h, s in registros)
+print(f"search con gaps afines | Test: {'PASS' if ok else 'FAIL'}")
+
+identidades = all_vs_all(secuencias[:3], metric="identity", algorithm="nw", jobs=2, tile=2, **afines)
+ok = identidades[0, 1] == calculate_identity(*nw_afin.alignment(secuencias[0], secuencias[1])[:2])
+print(f"all_vs_all (identidad) con gaps afines | Test: {'PASS' if ok else 'FAIL'}")
+
+fasta = os.path.join(tempfile.mkdtemp(), "registros.fasta")
+with open(fasta, 'w') as f:
+    f.writelines(f">{header}\n{secuencia}\n" for header, secuencia in registros)
+salida = subprocess.run([sys.executable, "-m", "src", 'examples/hemoglobin-homo-sapiens.txt', fasta, "--jobs", "1",
+                         "--format", "jsonl", "--mode", "linear", "--gap-open", "-5", "--gap-extend", "-1"],
+                        capture_output=True, text=True)
+shutil.rmtree(os.path.dirname(fasta))
+filas = sorted((json.loads(linea) for linea in salida.stdout.splitlines()), key=lambda fila: fila["subject"])
+ok = salida.returncode == 0 and [(f["subject"], f["score"]) for f in filas] == [(r.record, r.score) for r in resultados]
+print(f"python -m src con gaps afines | Test: {'PASS' if ok else 'FAIL'}")
@@ -0,0 +1,39 @@
+import os
+import tempfile
+
+from src.utils import read_fasta, FastaIndex, load_sequence_from_file
+
+print("="*80)
+print(" TEST: LECTOR FASTA MULTI-REGISTRO ".center(80, " "))
+print("="*80)
+
+# CASO 1: Un registro por archivo (examples/)
+for filename in sorted(os.listdir('examples')):
+    filepath = os.path.join('examples', filename)
+    registros = list(read_fasta(filepath))
+    ok = len(registros) == 1 and registros[0][1] == load_sequence_from_file(filepath)
+    print(f"{filename}: {len(registros[0][1])} residuos | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 2: Varios registros y acceso aleatorio por ID
+contenido = ">seq1 primera\nACGT\nacgt\n>seq2 segunda\nMKVL\n;comentario\nAA\n>seq3\nTTTT\n"
+with tempfile.NamedTemporaryFile('w', suffix='.fasta', delete=False) as f:
+    f.write(contenido)
+
+registros = list(read_fasta(f.name))
+print(f"Registros leídos: {len(registros)} | Test: {'PASS' if [h for h, _ in registros] == ['seq1 primera', 'seq2 segunda', 'seq3'] else 'FAIL'}")
+
+with FastaIndex(f.name) as indice:
+    header, secuencia = indice['seq2']
+    print(f"Acceso por ID seq2: {secuencia} | Test: {'PASS' if secuencia == 'MKVLAA' else 'FAIL'}")
+
+os.remove(f.name)
+
+# CASO 3: Encabezados con espacios al inicio de la línea (como line.strip())
+with tempfile.NamedTemporaryFile('w', suffix='.fasta', delete=False) as f:
+    f.write("  >seq1 primera\nACGT\n\t>seq2\n  TTGG \n")
+
+registros = list(read_fasta(f.name))
+ok = registros == [('seq1 primera', 'ACGT'), ('seq2', 'TTGG')] and load_sequence_from_file(f.name) == 'ACGTTTGG'
+print(f"Encabezados con espacios: {len(registros)} registros | Test: {'PASS' if ok else 'FAIL'}")
+
+os.remove(f.name)
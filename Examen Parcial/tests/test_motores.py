@@ -0,0 +1,239 @@
+import os
+import random
+import shutil
+import tempfile
+
+from src.algoritmos_alineamiento import NeedlemanWunsch, SmithWaterman, MetricasAlineamiento
+from src.vectorizado import NeedlemanWunschNumpy, SmithWatermanNumpy
+from src.utils import load_sequence_from_file, alignment_stats, count_matches, count_mismatches, count_gaps, calculate_identity
+from src.secuencias import SecuenciaCodificada
+from src.myers import NeedlemanWunschMyers
+from src.paralelo import parallel_alignment
+from src.cache import CacheAlineamientos
+from src.visualization import save_alignment_to_file
+from src.cigar import AlineamientoCigar
+
+print("="*80)
+print(" TEST: MOTORES ALTERNATIVOS ".center(80, " "))
+print("="*80)
+
+nw = NeedlemanWunsch(match=1, mismatch=-1, gap=-2)
+sw = SmithWaterman(match=1, mismatch=-1, gap=-2)
+
+# Pares de prueba
+pares = [
+    ("GCATGCU", "GATTACA"),
+    ("ACGTACGTACGT", "TACGT"),
+    (load_sequence_from_file('examples/hemoglobin-homo-sapiens.txt'),
+     load_sequence_from_file('examples/hemoglobin-rabbit.txt')),
+]
+
+# CASO 1: Llenado vectorizado (NumPy)
+nw_np = NeedlemanWunschNumpy(match=1, mismatch=-1, gap=-2)
+sw_np = SmithWatermanNumpy(match=1, mismatch=-1, gap=-2)
+
+for seq1, seq2 in pares:
+    esperado_nw = nw.alignment(seq1, seq2)[:3]
+    esperado_sw = sw.alignment(seq1, seq2)[:3]
+    obtenido_nw = nw_np.alignment(seq1, seq2)[:3]
+    obtenido_sw = sw_np.alignment(seq1, seq2)[:3]
+    print(f"NumPy NW ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if obtenido_nw == esperado_nw else 'FAIL'}")
+    print(f"NumPy SW ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if obtenido_sw == esperado_sw else 'FAIL'}")
+
+# CASO 2: Needleman-Wunsch en memoria lineal (Hirschberg)
+for seq1, seq2 in pares:
+    esperado = nw.alignment(seq1, seq2)[:3]
+    alin1, alin2, score, matriz = nw.alignment(seq1, seq2, mode="linear")
+    ok = (alin1, alin2, score) == esperado and matriz is None
+    print(f"Hirschberg NW ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if ok else 'FAIL'}")
+    obtenido_np = nw_np.alignment(seq1, seq2, mode="linear")[:3]
+    print(f"Hirschberg NumPy ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if obtenido_np == esperado else 'FAIL'}")
+
+# CASO 3: Solo puntuación (sin matriz ni traceback)
+for seq1, seq2 in pares:
+    ok_nw = nw.score_only(seq1, seq2) == nw.alignment(seq1, seq2)[2] == nw_np.score_only(seq1, seq2)
+    ok_sw = sw.score_only(seq1, seq2) == sw.alignment(seq1, seq2)[2] == sw_np.score_only(seq1, seq2)
+    print(f"Score-only NW ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if ok_nw else 'FAIL'}")
+    print(f"Score-only SW ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if ok_sw else 'FAIL'}")
+
+# CASO 4: Smith-Waterman en memoria lineal (ventana entre fin e inicio)
+for seq1, seq2 in pares:
+    esperado = sw.alignment(seq1, seq2)[:3]
+    alin1, alin2, score, matriz = sw.alignment(seq1, seq2, mode="linear")
+    ok = (alin1, alin2, score) == esperado and matriz is None
+    print(f"Lineal SW ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if ok else 'FAIL'}")
+    obtenido_np = sw_np.alignment(seq1, seq2, mode="linear")[:3]
+    print(f"Lineal SW NumPy ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if obtenido_np == esperado else 'FAIL'}")
+
+# CASO 5: Traceback con punteros de 2 bits
+for seq1, seq2 in pares:
+    for nombre, alg, alg_np in (("NW", nw, nw_np), ("SW", sw, sw_np)):
+        esperado = alg.alignment(seq1, seq2)[:3]
+        ok = alg.alignment(seq1, seq2, mode="pointers")[:3] == esperado
+        ok_np = alg_np.alignment(seq1, seq2, mode="pointers")[:3] == esperado
+        print(f"Punteros {nombre} ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if ok and ok_np else 'FAIL'}")
+
+# CASO 6: Matrices de sustitución (BLOSUM62 / PAM250)
+hemo_human, hemo_rabbit = pares[2]
+for matriz in ("BLOSUM62", "PAM250"):
+    nw_mat = NeedlemanWunsch(gap=-8, substitution_matrix=matriz)
+    nw_mat_np = NeedlemanWunschNumpy(gap=-8, substitution_matrix=matriz)
+    alin1, alin2, score, _ = nw_mat.alignment(hemo_human, hemo_rabbit)
+    ok = (score == nw_mat.score_alignment(alin1, alin2)
+          and nw_mat_np.alignment(hemo_human, hemo_rabbit)[:3] == (alin1, alin2, score))
+    print(f"{matriz} NW: score {score} | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 7: Secuencias codificadas (1 byte por residuo / 2 bits para ADN)
+seq1, seq2 = "ACGTACGTACGT", "TACGT"
+cod1 = SecuenciaCodificada.from_string(seq1, "dna", packed=True)
+cod2 = SecuenciaCodificada.from_string(seq2, "dna")
+ok = (str(cod1) == seq1 and cod1.nbytes == 3
+      and nw.alignment(cod1, cod2)[:3] == nw.alignment(seq1, seq2)[:3]
+      and sw_np.alignment(cod1, cod2)[:3] == sw.alignment(seq1, seq2)[:3])
+print(f"SecuenciaCodificada: {cod1.nbytes} bytes para {len(cod1)} bases | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 8: Needleman-Wunsch en banda (se ensancha hasta garantizar el óptimo)
+for seq1, seq2 in pares:
+    esperado = nw.alignment(seq1, seq2)[:3]
+    alin1, alin2, score, banda = nw.alignment(seq1, seq2, mode="banded")
+    ok = (alin1, alin2, score) == esperado
+    print(f"Banda NW ({len(seq1)}x{len(seq2)}), diagonales {banda.lo}..{banda.hi} | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 9: Distancia de edición bit-paralela (Myers)
+nw_edicion = NeedlemanWunsch(match=0, mismatch=-1, gap=-1)
+myers = NeedlemanWunschMyers(match=0, mismatch=-1, gap=-1)
+for seq1, seq2 in pares:
+    esperado = nw_edicion.alignment(seq1, seq2)[:3]
+    ok = (myers.score_only(seq1, seq2) == esperado[2] == -myers.edit_distance(seq1, seq2)
+          and myers.alignment(seq1, seq2, mode="banded")[:3] == esperado)
+    print(f"Myers ({len(seq1)}x{len(seq2)}): distancia {-esperado[2]} | Test: {'PASS' if ok else 'FAIL'}")
+distancia, inicio, fin = myers.best_hit("TACGA", "GGGACGTACGTTT")
+ok = (distancia, inicio, fin) == (1, 6, 10)
+print(f"Myers semiglobal: distancia {distancia} en [{inicio}, {fin}) | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 10: Gaps afines (Gotoh) con punteros empaquetados
+for nombre, clase in (("NW", NeedlemanWunsch), ("SW", SmithWaterman)):
+    lineal = clase(gap=-2).alignment(*pares[0])[:3]
+    ok = clase(gap_open=-2, gap_extend=-2).alignment(*pares[0])[:3] == lineal
+    print(f"Gotoh {nombre} con gap_open == gap_extend == gap | Test: {'PASS' if ok else 'FAIL'}")
+
+insulina_human = load_sequence_from_file('examples/insulin-homo-sapiens.txt')
+insulina_gorilla = load_sequence_from_file('examples/insulin-gorilla.txt')
+gotoh = NeedlemanWunsch(match=1, mismatch=-1, gap_open=-10, gap_extend=-1)
+alin1, alin2, score, _ = gotoh.alignment(insulina_human, insulina_gorilla)
+gaps = sum(1 for alin in (alin1, alin2) for k in range(len(alin))
+           if alin[k] == '-' and (k == 0 or alin[k-1] != '-'))
+ok = score == gotoh.score_alignment(alin1, alin2) == gotoh.score_only(insulina_human, insulina_gorilla)
+print(f"Gotoh NW insulina: score {score}, {gaps} gaps | Test: {'PASS' if ok else 'FAIL'}")
+
+# Extender más caro que abrir (también implícito: gap_open sin gap_extend usa gap=-2)
+rechazados = 0
+for parametros in ({"gap_open": -1}, {"gap_open": -1, "gap_extend": -3}, {"gap_open": -2, "gap_extend": 1}):
+    try:
+        NeedlemanWunsch(**parametros)
+    except ValueError:
+        rechazados += 1
+print(f"Gotoh con gap_open > gap_extend rechazado | Test: {'PASS' if rechazados == 3 else 'FAIL'}")
+
+# CASO 11: Un solo alineamiento en varios núcleos (bloques por frente de onda)
+for seq1, seq2 in pares:
+    for nombre, alg in (("NW", nw), ("SW", sw), ("NW NumPy", nw_np), ("SW NumPy", sw_np)):
+        esperado = alg.alignment(seq1, seq2)[:3]
+        alin1, alin2, score, matriz = parallel_alignment(alg, seq1, seq2, jobs=2, tile=32)
+        ok = (alin1, alin2, score) == esperado and matriz is None
+        print(f"Frente de onda {nombre} ({len(seq1)}x{len(seq2)}) | Test: {'PASS' if ok else 'FAIL'}")
+
+# Bordes del traceback en disco: si no caben, error antes de empezar
+try:
+    parallel_alignment(nw, "A" * 10**7, "A" * 10**7, jobs=1, tile=1)
+    ok = False
+except ValueError as error:
+    ok = "GB" in str(error)
+print(f"Frente de onda sin espacio para los bordes rechazado | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 12: Caché de resultados (LRU en memoria + SQLite en disco)
+directorio = tempfile.mkdtemp()
+base = os.path.join(directorio, "cache.sqlite")
+with CacheAlineamientos(max_entries=2, path=base) as cache:
+    for seq1, seq2 in pares + pares:
+        cache.alignment(nw, seq1, seq2)
+    ok = cache.misses == 3 and cache.hits == 3 and len(cache) == 2
+    ok = ok and cache.alignment(nw, *pares[2])[:3] == nw.alignment(*pares[2])[:3]
+    ok = ok and cache.alignment(sw, *pares[2])[:3] == sw.alignment(*pares[2])[:3] and cache.misses == 4
+    anclas = cache.alignment(nw, *pares[2], mode="anchors")[:3]
+    ok = ok and anclas == nw.alignment(*pares[2], mode="anchors")[:3] and cache.misses == 5
+with CacheAlineamientos(path=base) as otra:
+    otra.alignment(nw, *pares[0])
+    ok = ok and otra.disk_hits == 1 and otra.misses == 0
+shutil.rmtree(directorio)
+print(f"Caché: {cache.hits} aciertos, {cache.misses} fallos | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 13: Métricas por fase (desactivadas por defecto)
+metricas = MetricasAlineamiento()
+sw_medido = SmithWaterman(match=1, mismatch=-1, gap=-2, metrics=metricas)
+alin1, alin2, score, _ = sw_medido.alignment(hemo_human, hemo_rabbit)
+fases = set(metricas.phases)
+ok = (fases == {"initialize_matrix", "fill_matrix", "traceback", "find_max"}
+      and metricas.counters["cells"] == len(hemo_human) * len(hemo_rabbit)
+      and metricas.counters["traceback_steps"] == len(alin1)
+      and (alin1, alin2, score) == sw.alignment(hemo_human, hemo_rabbit)[:3]
+      and sw.metrics is None)
+print(f"Métricas: {', '.join(sorted(fases))} | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 14: Matriz compacta (búfer plano, opcionalmente mapeada a un archivo)
+for seq1, seq2 in pares:
+    esperado = nw.alignment(seq1, seq2)
+    alin1, alin2, score, compacta = nw.alignment(seq1, seq2, mode="compact")
+    ok = (alin1, alin2, score) == esperado[:3] and compacta.tolist() == esperado[3]
+    ok = ok and sw_np.alignment(seq1, seq2, mode="compact")[:3] == sw.alignment(seq1, seq2)[:3]
+    print(f"Matriz compacta ({len(seq1)}x{len(seq2)}): {compacta.nbytes} bytes | Test: {'PASS' if ok else 'FAIL'}")
+    compacta.close()
+
+directorio = tempfile.mkdtemp()
+archivo = os.path.join(directorio, "matriz.bin")
+alin1, alin2, score, compacta = sw.compact_alignment(hemo_human, hemo_rabbit, path=archivo)
+ok = ((alin1, alin2, score) == sw.alignment(hemo_human, hemo_rabbit)[:3]
+      and os.path.getsize(archivo) == compacta.nbytes and compacta[-1][-1] == sw.alignment(hemo_human, hemo_rabbit)[3][-1][-1])
+compacta.close()
+shutil.rmtree(directorio)
+print(f"Matriz compacta en archivo (mmap) | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 15: Reporte por bloques en un directorio elegido y estadísticas en una pasada
+directorio = tempfile.mkdtemp()
+alin1, alin2, score, _ = nw.alignment(hemo_human, hemo_rabbit)
+archivo = save_alignment_to_file(hemo_human, hemo_rabbit, alin1, alin2, score, "NW: Hemoglobina",
+                                 "nw_hemoglobina.txt", output_dir=directorio)
+with open(archivo, encoding='utf-8') as f, open(os.path.join('output', 'nw_hemoglobina.txt'), encoding='utf-8') as g:
+    ok = f.read() == g.read()
+shutil.rmtree(directorio)
+stats = alignment_stats(alin1, alin2)
+ok = ok and stats == (len(alin1), count_matches(alin1, alin2), count_mismatches(alin1, alin2),
+                      count_gaps(alin1) + count_gaps(alin2), calculate_identity(alin1, alin2))
+print(f"Reporte en directorio elegido, identidad {stats.identity:.2f}% | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 16: Alineamiento en tramos (CIGAR): coordenadas, estadísticas y cadenas bajo demanda
+for seq1, seq2 in pares:
+    ok = True
+    for alineador in (nw, sw, nw_np, sw_np, SmithWaterman(gap_open=-3, gap_extend=-1)):
+        alin1, alin2, score, _ = alineador.alignment(seq1, seq2, mode="pointers")
+        cigar, score_cigar, _ = alineador.cigar_alignment(seq1, seq2)
+        ok = ok and (cigar.to_strings(seq1, seq2) == (alin1, alin2) and score_cigar == score
+                     and cigar.stats() == alignment_stats(alin1, alin2)
+                     and str(seq1)[cigar.start1:cigar.end1] == alin1.replace('-', '')
+                     and AlineamientoCigar.parse(str(cigar), cigar.start1, cigar.start2) == cigar)
+    print(f"CIGAR ({len(seq1)}x{len(seq2)}): {str(cigar)[:30]} | Test: {'PASS' if ok else 'FAIL'}")
+
+# CASO 17: Alineamiento global por anclas (secuencias largas con una deleción grande)
+rng = random.Random(25)
+largo = ''.join(rng.choice('ACGT') for _ in range(3000))
+mutada = list(largo)
+for k in rng.sample(range(3000), 150):
+    mutada[k] = rng.choice('ACGT')
+mutada = ''.join(mutada[:1000] + mutada[1600:])
+nw_afin = NeedlemanWunsch(match=1, mismatch=-1, gap_open=-10, gap_extend=-1)
+alin1, alin2, score_afin, matriz = nw_afin.alignment(largo, mutada, mode="anchors")
+ok = (alin1.replace('-', '') == largo and alin2.replace('-', '') == mutada and matriz is None
+      and score_afin == nw_afin.score_alignment(alin1, alin2) == nw_afin.alignment(largo, mutada, mode="pointers")[2])
+alin1, alin2, score, _ = nw_np.alignment(largo, mutada, mode="anchors")
+ok = ok and alin1.replace('-', '') == largo and alin2.replace('-', '') == mutada and score == nw.score_alignment(alin1, alin2)
+print(f"Anclas ({len(largo)}x{len(mutada)}), score Gotoh {score_afin} | Test: {'PASS' if ok else 'FAIL'}")
@@ -0,0 +1,75 @@
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import threading
+
+from src.algoritmos_alineamiento import NeedlemanWunsch, SmithWaterman
+from src.servidor import ServidorAlineamiento, align_many, connect
+
+print("="*80)
+print(" TEST: SERVIDOR DE ALINEAMIENTOS ".center(80, " "))
+print("="*80)
+
+# El servidor corre en su propio bucle de eventos, en un hilo aparte
+loop = asyncio.new_event_loop()
+threading.Thread(target=loop.run_forever, daemon=True).start()
+
+
+def iniciar(**opciones):
+    return asyncio.run_coroutine_threadsafe(ServidorAlineamiento(**opciones).start(), loop).result()
+
+
+def cerrar(servidor):
+    asyncio.run_coroutine_threadsafe(servidor.close(), loop).result()
+
+
+rng = random.Random(0)
+pares = [(''.join(rng.choice('ACGT') for _ in range(rng.randint(5, 40))),
+          ''.join(rng.choice('ACGT') for _ in range(rng.randint(5, 40)))) for _ in range(500)]
+nw = NeedlemanWunsch(match=1, mismatch=-1, gap=-2)
+sw = SmithWaterman(match=1, mismatch=-1, gap=-2)
+
+# CASO 1: Muchas peticiones pequeñas por un socket Unix, agrupadas en lotes
+directorio = tempfile.mkdtemp()
+servidor = iniciar(path=os.path.join(directorio, "alineamientos.sock"), jobs=2, batch_size=32, max_queue=16)
+peticiones = [{"id": k, "algorithm": "nw" if k % 2 else "sw", "params": {"match": 1, "mismatch": -1, "gap": -2},
+               "seq1": seq1, "seq2": seq2} for k, (seq1, seq2) in enumerate(pares)]
+respuestas = {respuesta["id"]: respuesta for respuesta in align_many(servidor.address, peticiones)}
+ok = len(respuestas) == len(pares)
+for k, (seq1, seq2) in enumerate(pares):
+    alin1, alin2, score, _ = (nw if k % 2 else sw).alignment(seq1, seq2, mode="linear")
+    ok = ok and (respuestas[k]["aligned1"], respuestas[k]["aligned2"], respuestas[k]["score"]) == (alin1, alin2, score)
+print(f"{servidor.requests} peticiones en {servidor.batches} lotes | Test: {'PASS' if ok and servidor.batches < servidor.requests else 'FAIL'}")
+cerrar(servidor)
+
+# CASO 2: TCP local, puntuación, CIGAR y errores por petición (en el mismo lote que las válidas)
+servidor = iniciar(port=0, jobs=1, batch_wait=0.05)
+seq1, seq2 = pares[0]
+peticiones = [
+    {"id": "score", "algorithm": "nw", "seq1": seq1, "seq2": seq2, "score_only": True},
+    {"id": "cigar", "algorithm": "sw", "seq1": seq1, "seq2": seq2, "cigar": True},
+    {"id": "desconocido", "algorithm": "xx", "seq1": seq1, "seq2": seq2},
+    {"id": "incompleta", "algorithm": "nw", "seq1": seq1},
+    {"id": "matriz", "algorithm": "nw", "params": {"substitution_matrix": 5}, "seq1": seq1, "seq2": seq2},
+    {"id": "directorio", "algorithm": "nw", "params": {"substitution_matrix": directorio}, "seq1": seq1, "seq2": seq2},
+    {"id": "afin", "algorithm": "nw", "params": {"gap_open": -5, "gap_extend": -1}, "seq1": seq1, "seq2": seq2},
+]
+respuestas = {respuesta["id"]: respuesta for respuesta in align_many(servidor.address, peticiones)}
+cigar, score, _ = sw.cigar_alignment(seq1, seq2)
+ok = (respuestas["score"]["score"] == nw.score_only(seq1, seq2)
+      and (respuestas["cigar"]["cigar"], respuestas["cigar"]["start1"]) == (str(cigar), cigar.start1)
+      and all("error" in respuestas[clave] for clave in ("desconocido", "incompleta", "matriz", "directorio"))
+      and respuestas["afin"]["score"] == NeedlemanWunsch(gap_open=-5, gap_extend=-1).alignment(seq1, seq2)[2])
+print(f"TCP {servidor.address[0]}: {respuestas['desconocido']['error']} | Test: {'PASS' if ok else 'FAIL'}")
+
+# Una línea que no es JSON recibe un error y la conexión sigue abierta
+with connect(servidor.address) as sock, sock.makefile('rw', encoding='utf-8') as stream:
+    stream.write("esto no es JSON\n" + '{"id": 7, "algorithm": "nw", "seq1": "ACGT", "seq2": "ACGT"}\n')
+    stream.flush()
+    error, respuesta = stream.readline(), stream.readline()
+ok = '"error"' in error and '"id": 7' in respuesta
+print(f"Línea inválida | Test: {'PASS' if ok else 'FAIL'}")
+cerrar(servidor)
+shutil.rmtree(directorio)